@@ -1,3 +1,6 @@
+import time
+STARTUP_STARTED = time.perf_counter()  # for the startup timing report
+
 import sys
 import json
 import os
@@ -5,8 +8,20 @@ import subprocess
 import ctypes
 import re
 import shlex
-
-from PyQt5.QtCore import Qt
+import signal
+import base64
+import queue
+import csv
+import hashlib
+import argparse
+import bisect
+import threading
+import heapq
+import uuid
+from collections import OrderedDict, namedtuple, deque
+
+from PyQt5.QtCore import Qt, QObject, QTimer, QTime, pyqtSignal
+from PyQt5.QtGui import QFontDatabase, QKeySequence
 from PyQt5.QtWidgets import (
     QApplication,
     QMainWindow,
@@ -31,9 +46,29 @@ from PyQt5.QtWidgets import (
     QFormLayout,
     QCheckBox,
     QListWidget,
-    QSplitter
+    QTreeWidget,
+    QTreeWidgetItem,
+    QSplitter,
+    QMenu,
+    QSpinBox,
+    QTimeEdit,
+    QShortcut
 )
 
+IMPORTS_FINISHED = time.perf_counter()
+
+PALETTE_MAX_RESULTS = 20
+PLACEHOLDER_HISTORY_SIZE = 20  # remembered values per placeholder name
+
+# Startup fills only the first screenful of rows before the window is shown;
+# the rest of the table is filled in chunks from the event loop
+FIRST_PAINT_ROWS = 60
+TABLE_FILL_CHUNK = 500
+# ... unless the window doesn't paint (started minimized or hidden)
+STARTUP_FALLBACK_MS = 1000
+# Removing more scattered rows than this rebuilds the table instead
+TABLE_REMOVE_ROWS_MAX = 200
+
 ###############################################################################
 # Define the Light/Dark stylesheets
 ###############################################################################
@@ -92,6 +127,14 @@ QListWidget::item:selected {
     background-color: #0078d7;
     color: #ffffff;
 }
+QTreeWidget {
+    background-color: #ffffff;
+    color: #000000;
+}
+QTreeWidget::item:selected {
+    background-color: #0078d7;
+    color: #ffffff;
+}
 """
 
 DARK_STYLESHEET = """
@@ -152,6 +195,14 @@ QListWidget::item:selected {
     background-color: #555555;
     color: #ffffff;
 }
+QTreeWidget {
+    background-color: #3b3b3b;
+    color: #ffffff;
+}
+QTreeWidget::item:selected {
+    background-color: #555555;
+    color: #ffffff;
+}
 """
 
 ###############################################################################
@@ -207,285 +258,2309 @@ def get_app_folder():
         return os.path.dirname(os.path.abspath(__file__))
 
 ###############################################################################
-# Theme toggle switch
+# Shared catalog file (lock file, atomic writes, three-way merge)
 ###############################################################################
 
-class ThemeToggleSwitch(QCheckBox):
+CATALOG_LOCK_TIMEOUT = 5.0    # seconds to wait for another instance's write
+CATALOG_LOCK_STALE = 30.0     # a lock older than this was left by a crashed instance
+CATALOG_SYNC_INTERVAL_MS = 3000
+
+
+class CatalogLockTimeout(Exception):
+    pass
+
+
+class CatalogLock:
     """
-    A QCheckBox styled as a small toggle switch.
-    We'll rely on toggled(bool) to know if it's ON (dark) or OFF (light).
+    Cross-process lock around writes to shortcuts.json: a <file>.lock file
+    created with O_CREAT | O_EXCL, which works the same on local disks and
+    network shares. Readers don't lock, because writes replace the file
+    atomically. The lock holds a token unique to its holder, so a stale lock
+    can be broken without breaking a fresh one by mistake.
     """
-    def __init__(self, parent=None, checked=False):
-        super().__init__(parent)
-        self.setChecked(checked)
-        self.setText("")  # No label text
-        self.setCursor(Qt.PointingHandCursor)
-        self.setStyleSheet(TOGGLE_SWITCH_QSS)
-
-    def on_link_file(self):
+    def __init__(self, path, timeout=CATALOG_LOCK_TIMEOUT, stale_after=CATALOG_LOCK_STALE):
+        self.lock_path = path + ".lock"
+        self.timeout = timeout
+        self.stale_after = stale_after
+
+    def __enter__(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                fd = os.open(self.lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if self._break_stale_lock():
+                    continue
+                if time.monotonic() > deadline:
+                    raise CatalogLockTimeout(f"{self.lock_path} is held by another Commander")
+                time.sleep(0.05)
+                continue
+            with os.fdopen(fd, "w") as f:
+                f.write(f"{os.getpid()} {uuid.uuid4().hex}\n")
+            return self
+
+    def _break_stale_lock(self):
         """
-        Let the user pick a .bat or .ps1 file and store that path in self.command_edit.
+        Remove the lock if its holder seems to have died (not touched for
+        stale_after seconds). Returns True if the caller should try again at
+        once. The lock is renamed away rather than deleted, so of several
+        waiters only one gets it; if what it got isn't the lock it judged
+        stale (another waiter already replaced that with a fresh one), it is
+        put back.
         """
-        file_filter = "Scripts (*.bat *.ps1);;All Files (*)"
-        file_path, _ = QFileDialog.getOpenFileName(self, "Select Script", "", file_filter)
-        if file_path:
-            self.command_edit.setText(file_path)
+        try:
+            with open(self.lock_path, "r") as f:
+                token = f.read()
+            if time.time() - os.stat(self.lock_path).st_mtime <= self.stale_after:
+                return False
+            claimed = f"{self.lock_path}.{uuid.uuid4().hex}.stale"
+            os.rename(self.lock_path, claimed)
+        except FileNotFoundError:
+            return True  # Released (or taken over) meanwhile
+        except OSError:
+            return False
 
-    def on_ok_clicked(self):
-        """
-        Gather all data, store in self.result_data, and accept the dialog.
-        """
-        name = self.name_edit.text().strip()
-        command = self.command_edit.text().strip()
-        description = self.description_edit.text().strip()
-        tags_str = self.tags_edit.text().strip()
-        category = self.category_edit.text().strip()
+        try:
+            with open(claimed, "r") as f:
+                if f.read() != token:
+                    os.link(claimed, self.lock_path)
+        except OSError:
+            pass
+        finally:
+            try:
+                os.remove(claimed)
+            except OSError:
+                pass
+        return True
 
-        # Convert tags to a list
-        if tags_str:
-            tags_list = [tag.strip() for tag in tags_str.split(",")]
-        else:
-            tags_list = []
+    def __exit__(self, *exc):
+        try:
+            os.remove(self.lock_path)
+        except OSError:
+            pass
 
-        self.result_data = {
-            "name": name,
-            "command": command,
-            "description": description,
-            "tags": tags_list,
-            "category": category
-        }
-        self.accept()
-    
-    def get_data(self):
-        """
-        Returns the final data from the dialog as a dict.
-        """
-        return self.result_data
-    
-###############################################################################
-# Standard Windows Admin-check logic (if you're still using admin re-launch)
-###############################################################################
 
-def is_user_admin():
+def file_fingerprint(path):
     """
-    Returns True if the current Python process is running with admin privileges (Windows).
+    (inode, mtime_ns, size), or None if the file doesn't exist. Atomic
+    replaces give the file a new inode, so same-size rewrites within the
+    mtime resolution are still noticed.
     """
     try:
-        return ctypes.windll.shell32.IsUserAnAdmin()
-    except:
-        return False
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
 
 
-def relaunch_as_admin():
+def read_catalog_file(path):
     """
-    Relaunches the current script with admin rights via ShellExecuteW.
-    Returns True if relaunch was attempted, False if already admin or any error occurred.
+    Parsed contents of shortcuts.json, or None if it's missing, unreadable,
+    half-written or has no "shortcuts" list. Callers must not mistake None
+    for an empty catalog: merging with it would drop every record.
     """
-    if is_user_admin():
-        return False  # already admin
-
     try:
-        # Re-run the script with 'runas' param
-        params = " ".join(sys.argv[1:])  # pass existing command line args if needed
-        ctypes.windll.shell32.ShellExecuteW(None, "runas", sys.executable, sys.argv[0] + " " + params, None, 1)
-        return True
-    except Exception as e:
-        print("Failed to elevate:", e)
-        return False
-    
-###############################################################################
-# Commander Class
-###############################################################################
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or not isinstance(data.get("shortcuts"), list):
+        return None
+    return data
 
-class Commander(QMainWindow):
-    def __init__(self, json_path="shortcuts.json"):
-        super().__init__()
-        self.json_path = os.path.join(get_app_folder(), "shortcuts.json")
-        self.shortcuts_data = []
 
-        # This new list will store (shortcut, original_index) for the currently displayed table rows
-        self.displayed_pairs = []
+def atomic_write_json(path, data):
+    """
+    Write to a temp file in the same folder, then swap it in with os.replace,
+    so other instances never read a half-written catalog.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    for attempt in range(5):
+        try:
+            os.replace(tmp_path, path)
+            return
+        except PermissionError:
+            # Windows refuses while another process has the file open for reading
+            if attempt == 4:
+                os.remove(tmp_path)
+                raise
+            time.sleep(0.05)
 
-        # Set a default theme before initializing the UI
-        self.current_theme = "light"  # Default to light theme
 
-        # Track which category is selected (None => show all)
-        self.selected_category = None
+def new_record_uid():
+    return uuid.uuid4().hex[:16]
 
-        # Window Title & Initial Size
-        self.setWindowTitle("Commander")
-        self.setMinimumSize(800, 400)
-        self.resize(1000, 600)
 
-        # Keep track of two-step confirm state
-        self.confirmation_pending = False
+def same_record(a, b):
+    """
+    True if two shortcut records are equal apart from their version stamps.
+    """
+    if a is None or b is None:
+        return a is b
+    return {k: v for k, v in a.items() if k != "version"} == {k: v for k, v in b.items() if k != "version"}
 
-        self.load_shortcuts()
-        self.initUI()
-        self.apply_theme(self.current_theme)  # Apply the loaded theme after UI initialization
 
-        # Initially show all shortcuts
-        pairs = [(s, i) for i, s in enumerate(self.shortcuts_data)]
-        self.populate_table(pairs)
+def merge_catalog(disk, local, dirty, synced):
+    """
+    Three-way merge of this instance's changes into the records on disk.
 
-    ###########################################################################
-    # SIDEBAR / CATEGORY
-    ###########################################################################
-    def update_category_list(self):
-        """
-        Gather unique category names from self.shortcuts_data.
-        Store them in self.available_categories as a sorted list.
-        """
-        categories = set()
-        for s in self.shortcuts_data:
-            cat = s.get("category", "").strip()
-            if cat:
-                categories.add(cat)
-        self.available_categories = sorted(categories)
+    disk:   records currently in the file
+    local:  this instance's records, in its order
+    dirty:  uids added, edited or deleted here since the last sync
+    synced: uid -> version this instance last saw on disk (the common base)
 
-    def update_category_sidebar(self):
-        """
-        Clear and repopulate the category_list QListWidget.
-        Includes an '(All Categories)' item to reset filter.
-        """
-        self.category_list.clear()
-        self.update_category_list()  # Make sure self.available_categories is up to date
+    A dirty record is written with version + 1 if the disk still has the
+    base version; otherwise another instance changed it too, and unless
+    both made the same change it becomes a conflict and the disk copy is
+    kept. Everything not dirty here is taken from disk.
 
-        # Add an item to show all categories
-        self.category_list.addItem("(All Categories)")
+    Returns (records to write, conflicts) with conflicts as a list of
+    (uid, mine or None, theirs or None).
+    """
+    local_by_uid = {s["uid"]: s for s in local}
+    disk_by_uid = {s["uid"]: s for s in disk}
+
+    changes = {}  # uid -> record to write, or None to delete
+    conflicts = []
+    for uid in dirty:
+        mine = local_by_uid.get(uid)
+        theirs = disk_by_uid.get(uid)
+        their_version = theirs.get("version") if theirs is not None else None
+        if their_version != synced.get(uid):
+            if not same_record(mine, theirs):
+                conflicts.append((uid, mine, theirs))
+            continue
+        changes[uid] = None if mine is None else dict(mine, version=(their_version or 0) + 1)
+
+    merged = [changes.get(s["uid"], s) for s in disk]
+    merged = [s for s in merged if s is not None]
+    merged.extend(
+        changes[s["uid"]] for s in local
+        if s["uid"] not in disk_by_uid and changes.get(s["uid"]) is not None
+    )
+    return merged, conflicts
 
-        # Add the individual categories
-        for cat in self.available_categories:
-            self.category_list.addItem(cat)
+###############################################################################
+# Bulk import (JSON / JSON-lines / CSV)
+###############################################################################
 
-    def on_category_selected(self, item):
-        """
-        Called when the user clicks a category in the sidebar.
-        If '(All Categories)', reset self.selected_category to None.
-        Otherwise, set self.selected_category to the category text.
-        Then call filter_table().
-        """
-        cat_text = item.text()
-        if cat_text == "(All Categories)":
-            self.selected_category = None
-        else:
-            self.selected_category = cat_text
+IMPORT_CHUNK_SIZE = 64 * 1024
 
-        self.filter_table()
 
-    ###########################################################################
-    # UI SETUP
-    ###########################################################################
-    def initUI(self):
-        central_widget = QWidget()
-        self.setCentralWidget(central_widget)
+def shortcut_key(shortcut):
+    """
+    Returns a compact hash of the normalized name + command of a shortcut.
+    Case and runs of whitespace are ignored, so "Ping  Google" and
+    "ping google" are treated as the same shortcut.
+    """
+    name = " ".join(shortcut.get("name", "").split()).lower()
+    command = " ".join(shortcut.get("command", "").split()).lower()
+    return hashlib.blake2b(f"{name}\x00{command}".encode("utf-8"), digest_size=16).digest()
 
-        # Create the main horizontal layout
-        main_layout = QHBoxLayout()
-        central_widget.setLayout(main_layout)
 
-        # Create the splitter
-        splitter = QSplitter(Qt.Horizontal)
+def coerce_import_record(raw):
+    """
+    Turn one raw imported record (dict from JSON or CSV) into a shortcut dict.
+    Returns None if the record has no name or no command.
+    """
+    if not isinstance(raw, dict):
+        return None
 
-        # 1) Left Sidebar: Category List
-        self.category_list = QListWidget()
-        self.category_list.itemClicked.connect(self.on_category_selected)
-        # We'll call update_category_sidebar() after load_shortcuts to fill it
+    name = str(raw.get("name") or "").strip()
+    command = str(raw.get("command") or "").strip()
+    if not name or not command:
+        return None
 
-        splitter.addWidget(self.category_list)  # Add the category list to the splitter
+    tags = raw.get("tags") or []
+    if isinstance(tags, str):
+        tags = tags.split(",")
+    tags_list = [str(tag).strip() for tag in tags if str(tag).strip()]
+
+    requires_input = raw.get("requires_input", False)
+    if isinstance(requires_input, str):
+        requires_input = requires_input.strip().lower() in ("1", "true", "yes", "y")
+
+    shortcut = {
+        "name": name,
+        "command": command,
+        "description": str(raw.get("description") or "").strip(),
+        "tags": tags_list,
+        "category": str(raw.get("category") or "").strip(),
+        "requires_input": bool(requires_input)
+    }
+    group = str(raw.get("group") or "").strip()
+    if group:
+        shortcut["group"] = group
+    return shortcut
+
+
+def iter_json_array(f, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Stream the elements of a JSON array without loading the whole file.
+    Accepts either a top-level array or a Commander-style object with a
+    "shortcuts" array (the format of shortcuts.json).
+    """
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    eof = False
+
+    def read_more():
+        # Drop the already-consumed part so the buffer stays small
+        nonlocal buf, pos, eof
+        chunk = f.read(chunk_size)
+        if chunk:
+            buf = buf[pos:] + chunk
+            pos = 0
+        else:
+            eof = True
+
+    # 1) Find the opening bracket of the array
+    while True:
+        stripped = buf.lstrip()
+        if stripped.startswith("["):
+            pos = buf.index("[") + 1
+            break
+        if stripped.startswith("{"):
+            match = re.search(r'"shortcuts"\s*:\s*\[', buf)
+            if match:
+                pos = match.end()
+                break
+        elif stripped:
+            raise ValueError("Expected a JSON array or an object with a 'shortcuts' array.")
+        if eof:
+            raise ValueError("No shortcuts array found in JSON file.")
+        read_more()
+
+    # 2) Decode one element at a time
+    while True:
+        while pos < len(buf) and buf[pos] in " \t\r\n,":
+            pos += 1
+        if pos >= len(buf):
+            if eof:
+                raise ValueError("Unexpected end of JSON file.")
+            read_more()
+            continue
+        if buf[pos] == "]":
+            return
 
-        # 2) Right Panel
-        right_panel = QVBoxLayout()
+        try:
+            element, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            read_more()
+            continue
 
-        # ========== Search Row ==========
-        search_layout = QHBoxLayout()
-        search_label = QLabel("Search:")
-        self.search_bar = QLineEdit()
-        self.search_bar.setPlaceholderText("Search Current Category...")
-        self.search_bar.setClearButtonEnabled(True)
-        self.search_bar.textChanged.connect(self.filter_table)
+        pos = end
+        yield element
 
-        search_layout.addWidget(search_label)
-        search_layout.addWidget(self.search_bar)
 
-        # Add the toggle switch to the same row
-        self.theme_toggle_switch = ThemeToggleSwitch(checked=(self.current_theme == "dark"))
-        self.theme_toggle_switch.toggled.connect(self.on_theme_switch_toggled)
-        search_layout.addWidget(self.theme_toggle_switch)
+def iter_import_records(path):
+    """
+    Yield raw records from a .json, .jsonl/.ndjson or .csv file, one at a time.
+    """
+    ext = os.path.splitext(path)[1].lower()
+
+    if ext == ".csv":
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            for row in csv.DictReader(f):
+                yield row
+    elif ext in (".jsonl", ".ndjson"):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            yield from iter_json_array(f)
 
-        right_panel.addLayout(search_layout)
+###############################################################################
+# Process accounting (wall time, exit code, peak RSS, CPU time) + run history
+###############################################################################
 
-        # ========== Table ==========
-        self.table = QTableWidget()
-        self.table.setColumnCount(4)
-        self.table.setHorizontalHeaderLabels(["Name", "Command", "Tags", "Category"])
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setSelectionMode(QTableWidget.SingleSelection)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
-        self.table.cellClicked.connect(self.on_table_select)
-        right_panel.addWidget(self.table)
+RUN_HISTORY_FILE = "run_history.jsonl"
+RUN_HISTORY_MAX_RECORDS = 2000  # older runs rotate out
 
-        # ========== CRUD + Bottom Layout ==========
-        bottom_layout = QHBoxLayout()
+RunRecord = namedtuple(
+    "RunRecord",
+    ["name", "command", "started_at", "wall_time", "exit_code", "peak_rss_kb", "cpu_time"]
+)
 
-        # Execute Button
-        self.execute_button = QPushButton("Execute")
-        self.execute_button.setEnabled(False)
-        self.execute_button.clicked.connect(self.on_execute_clicked)
 
-        # CRUD Buttons (Add, Edit, Delete)
-        crud_layout = QHBoxLayout()
+def _windows_process_usage(handle):
+    """
+    (peak_rss_kb, cpu_time) of a finished process via its Win32 handle.
+    """
+    from ctypes import wintypes
+
+    class FILETIME(ctypes.Structure):
+        _fields_ = [("low", wintypes.DWORD), ("high", wintypes.DWORD)]
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
 
-        self.add_button = QPushButton("Add Shortcut")
-        self.add_button.clicked.connect(self.on_add_shortcut)
-        crud_layout.addWidget(self.add_button)
+    kernel32 = ctypes.windll.kernel32
+    handle = wintypes.HANDLE(int(handle))
 
-        self.edit_button = QPushButton("Edit Shortcut")
-        self.edit_button.clicked.connect(self.on_edit_shortcut)
-        self.edit_button.setEnabled(False)
-        crud_layout.addWidget(self.edit_button)
+    cpu_time = None
+    creation, exit_time, kernel, user = FILETIME(), FILETIME(), FILETIME(), FILETIME()
+    if kernel32.GetProcessTimes(handle, ctypes.byref(creation), ctypes.byref(exit_time),
+                                ctypes.byref(kernel), ctypes.byref(user)):
+        # FILETIME counts 100ns ticks
+        ticks = (kernel.high << 32 | kernel.low) + (user.high << 32 | user.low)
+        cpu_time = ticks / 10000000
 
-        self.delete_button = QPushButton("Delete Shortcut")
-        self.delete_button.clicked.connect(self.on_delete_shortcut)
-        self.delete_button.setEnabled(False)
-        crud_layout.addWidget(self.delete_button)
+    peak_rss_kb = None
+    counters = PROCESS_MEMORY_COUNTERS()
+    counters.cb = ctypes.sizeof(counters)
+    if kernel32.K32GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+        peak_rss_kb = counters.PeakWorkingSetSize // 1024
 
-        right_panel.addLayout(crud_layout)
+    return peak_rss_kb, cpu_time
 
-        # Info Label
-        self.info_label = QLabel("")
-        self.info_label.setStyleSheet(
-            "color: #333333;" if self.current_theme == "light" else "color: #dddddd;"
-        )
 
-        bottom_layout.addWidget(self.execute_button)
-        bottom_layout.addWidget(self.info_label)
+def wait_and_measure(proc):
+    """
+    Wait for a Popen process and return (exit_code, peak_rss_kb, cpu_time).
+    Uses os.wait4 on POSIX (its rusage includes reaped child processes) and
+    GetProcessTimes / GetProcessMemoryInfo on Windows. Anywhere else only the
+    exit code is known and the other two values are None.
+    """
+    if hasattr(os, "wait4"):
+        try:
+            _, status, usage = os.wait4(proc.pid, 0)
+        except ChildProcessError:
+            return proc.wait(), None, None
 
-        right_panel.addLayout(bottom_layout)
+        exit_code = os.WEXITSTATUS(status) if os.WIFEXITED(status) else -os.WTERMSIG(status)
+        proc.returncode = exit_code  # we reaped it, so Popen must not wait again
 
-        # Wrap the right panel layout in a QWidget
-        right_panel_widget = QWidget()
-        right_panel_widget.setLayout(right_panel)
+        # ru_maxrss is KB on Linux but bytes on macOS
+        peak_rss_kb = usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+        return exit_code, peak_rss_kb, usage.ru_utime + usage.ru_stime
 
-        # Add the right panel widget to the splitter
-        splitter.addWidget(right_panel_widget)
+    exit_code = proc.wait()
+    if sys.platform == "win32":
+        try:
+            return (exit_code,) + _windows_process_usage(proc._handle)
+        except (AttributeError, OSError):
+            pass
+    return exit_code, None, None
 
-        # Set initial sizes or stretch factors
-        splitter.setStretchFactor(0, 0)  # Left pane does not expand as much
-        splitter.setStretchFactor(1, 1)  # Right pane expands more
 
-        # Set default sizes (adjust as needed for your desired ratio)
-        splitter.setSizes([150, 400])  # Left panel starts with 1/3 width, right panel 2/3
-        
-        # Add the splitter to the main layout
-        main_layout.addWidget(splitter)
+def stays_open(full_cmd):
+    """
+    True if full_cmd opens a console that waits for the user after the
+    command is done ('cmd /k', 'powershell -NoExit'). Measuring such a process
+    measures the console, so its runs are not recorded.
+    """
+    program = full_cmd[0].replace("\\", "/").rsplit("/", 1)[-1].lower()
+    lowered = [token.lower() for token in full_cmd[1:]]
+    if program in ("cmd", "cmd.exe"):
+        return "/k" in lowered
+    if program in ("powershell", "powershell.exe", "pwsh", "pwsh.exe"):
+        return "-noexit" in lowered
+    return False
 
-        # Finally, update the category sidebar to show all categories
-        self.update_category_sidebar()
 
-    ###########################################################################
-    # THEME LOGIC
-    ###########################################################################
+class RunHistory:
+    """
+    Bounded history of RunRecords, kept in memory and appended to a JSON-lines
+    file. When the file holds twice max_records lines it is rewritten with only
+    the newest max_records, so it never grows without bound.
+    Safe to call record() from worker threads.
+    """
+    def __init__(self, path, max_records=RUN_HISTORY_MAX_RECORDS):
+        self.path = path
+        self.max_records = max_records
+        self.records = deque(maxlen=max_records)
+        self._lines_on_disk = 0
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    self._lines_on_disk += 1
+                    try:
+                        self.records.append(RunRecord(*json.loads(line)))
+                    except (ValueError, TypeError):
+                        continue  # skip a damaged line
+        except OSError:
+            pass  # no history yet
+
+    def record(self, run_record):
+        with self._lock:
+            self.records.append(run_record)
+            try:
+                if self._lines_on_disk >= 2 * self.max_records:
+                    tmp_path = self.path + ".tmp"
+                    with open(tmp_path, "w", encoding="utf-8") as f:
+                        for r in self.records:
+                            f.write(json.dumps(list(r)) + "\n")
+                    os.replace(tmp_path, self.path)
+                    self._lines_on_disk = len(self.records)
+                else:
+                    with open(self.path, "a", encoding="utf-8") as f:
+                        f.write(json.dumps(list(run_record)) + "\n")
+                    self._lines_on_disk += 1
+            except OSError as e:
+                print("Could not write run history:", e)
+
+    def snapshot(self):
+        with self._lock:
+            return list(self.records)
+
+###############################################################################
+# Captured runs + TTL result cache (for read-only diagnostic shortcuts)
+###############################################################################
+
+DEFAULT_CACHE_TTL = 60            # seconds a cached result stays fresh
+RESULT_CACHE_MAX_ENTRIES = 64     # LRU bound on the number of cached results
+RESULT_CACHE_MAX_CHARS = 4000000  # LRU bound on the total cached output size
+CAPTURE_TIMEOUT = 120             # seconds before a captured run is killed
+
+CommandResult = namedtuple(
+    "CommandResult",
+    ["output", "exit_code", "duration", "finished_at", "peak_rss_kb", "cpu_time"]
+)
+
+
+def kill_process_tree(proc):
+    """
+    Kill a process started by run_captured together with anything it spawned
+    (e.g. the command cmd.exe or sh is running), so its pipes close.
+    """
+    try:
+        if sys.platform == "win32":
+            subprocess.run(
+                ["taskkill", "/F", "/T", "/PID", str(proc.pid)],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0)
+            )
+        else:
+            os.killpg(proc.pid, signal.SIGKILL)
+    except OSError:
+        pass
+    if proc.poll() is None:
+        proc.kill()
+
+
+def run_captured(full_cmd, timeout=CAPTURE_TIMEOUT):
+    """
+    Run full_cmd to completion (no console window) and capture stdout + stderr.
+    Returns a CommandResult; exit_code is None if the process could not be
+    started or was killed after the timeout.
+    """
+    started = time.monotonic()
+    try:
+        proc = subprocess.Popen(
+            full_cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            stdin=subprocess.DEVNULL,
+            text=True,
+            errors="replace",
+            creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
+            start_new_session=(sys.platform != "win32")  # own process group, see kill_process_tree
+        )
+    except OSError as e:
+        return CommandResult(f"Error executing: {e}", None, time.monotonic() - started, time.time(), None, None)
+
+    timed_out = threading.Event()
+
+    def kill_on_timeout():
+        timed_out.set()
+        kill_process_tree(proc)
+
+    killer = threading.Timer(timeout, kill_on_timeout)
+    killer.start()
+    try:
+        output = proc.stdout.read()
+        proc.stdout.close()
+        exit_code, peak_rss_kb, cpu_time = wait_and_measure(proc)
+    finally:
+        killer.cancel()
+
+    if timed_out.is_set():
+        output += f"\n[Killed after {timeout} seconds]"
+        exit_code = None
+
+    return CommandResult(output, exit_code, time.monotonic() - started, time.time(), peak_rss_kb, cpu_time)
+
+
+class ResultCache:
+    """
+    LRU cache of CommandResults keyed by the fully substituted command.
+    Each entry expires after its own TTL; the cache is bounded both by
+    entry count and by the total number of cached output characters.
+    """
+    def __init__(self, max_entries=RESULT_CACHE_MAX_ENTRIES, max_chars=RESULT_CACHE_MAX_CHARS):
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self.total_chars = 0
+        self._entries = OrderedDict()  # key -> (expires_at, result)
+
+    def get(self, key):
+        """
+        Returns (result, seconds_left) for a fresh entry, or None.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, result = entry
+        seconds_left = expires_at - time.monotonic()
+        if seconds_left <= 0:
+            self.invalidate(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return result, seconds_left
+
+    def put(self, key, result, ttl):
+        self.invalidate(key)
+        if ttl <= 0 or len(result.output) > self.max_chars:
+            return
+
+        self._entries[key] = (time.monotonic() + ttl, result)
+        self.total_chars += len(result.output)
+
+        # Evict least recently used entries until we're back within bounds
+        while len(self._entries) > self.max_entries or self.total_chars > self.max_chars:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.total_chars -= len(evicted.output)
+
+    def invalidate(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.total_chars -= len(entry[1].output)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class CommandRunner(QObject):
+    """
+    Runs one captured command on a background thread so the UI stays responsive.
+    task is a callable returning a CommandResult (e.g. a run_captured call).
+    finished(CommandResult) is delivered on the GUI thread.
+    """
+    finished = pyqtSignal(object)
+
+    def __init__(self, task, parent=None):
+        super().__init__(parent)
+        self.task = task
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self):
+        self.finished.emit(self.task())
+
+
+class FanOutRunner(QObject):
+    """
+    Runs many captured commands on a bounded thread pool.
+    result_ready(index, CommandResult) is delivered on the GUI thread as each
+    command finishes. The runner has no Qt parent on purpose: its worker
+    threads keep it alive even if the dialog that started it goes away.
+    """
+    result_ready = pyqtSignal(int, object)
+
+    def __init__(self, full_cmds, max_workers, timeout=CAPTURE_TIMEOUT):
+        super().__init__()
+        self.full_cmds = full_cmds
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self._stopped = threading.Event()
+
+    def start(self):
+        # Imported here: concurrent.futures (and the logging it pulls in) is
+        # only needed once a fan-out actually runs
+        from concurrent.futures import ThreadPoolExecutor
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        for index, full_cmd in enumerate(self.full_cmds):
+            executor.submit(self._run, index, full_cmd)
+        executor.shutdown(wait=False)
+
+    def stop(self):
+        """
+        Commands already running finish; the rest are reported as stopped.
+        """
+        self._stopped.set()
+
+    def _run(self, index, full_cmd):
+        if self._stopped.is_set():
+            result = CommandResult("[Stopped before it started]", None, 0.0, time.time(), None, None)
+        else:
+            result = run_captured(full_cmd, self.timeout)
+        self.result_ready.emit(index, result)
+
+###############################################################################
+# Warm shell hosts (pre-started shells fed over stdin)
+###############################################################################
+
+SHELL_POOL_SIZE = 2          # idle hosts kept warm per shell kind
+SHELL_HOST_MAX_USES = 50     # recycle a host after this many commands
+SHELL_HOST_MAX_AGE = 600     # ... or after this many seconds
+SHELL_HOST_MAX_MEMORY = 2 * 1024 * 1024 * 1024  # bytes per process in a host
+SHELL_HOST_MAX_CPU_SECONDS = CAPTURE_TIMEOUT    # per command (bash only)
+SHELL_HOST_MAX_PROCESSES = 64                   # processes alive in a host at once (Windows only)
+
+
+def warm_host_script(command):
+    """
+    Split a shortcut command into (shell_kind, script) for a warm host.
+    "powershell [-flags] -Command <script>" / "-File <path>" go to a PowerShell
+    host; everything else goes to cmd on Windows and bash elsewhere.
+    """
+    stripped = command.strip()
+    first, _, rest = stripped.partition(" ")
+    if not first.lower().startswith(("powershell", "pwsh")):
+        return ("cmd" if sys.platform == "win32" else "bash"), stripped
+
+    # Drop host-level switches; the warm host already has its own
+    rest = rest.strip()
+    while rest.startswith("-"):
+        switch, _, remainder = rest.partition(" ")
+        switch = switch.lower()
+        if switch in ("-command", "-c"):
+            return "powershell", remainder.strip()
+        if switch in ("-file", "-f"):
+            return "powershell", f"& {remainder.strip()}"
+        if switch in ("-executionpolicy", "-ep", "-windowstyle"):
+            remainder = remainder.strip().partition(" ")[2]
+        rest = remainder.strip()
+    return "powershell", rest
+
+
+def _windows_job_object(handle):
+    """
+    Put a process (and everything it starts later) in a new Job Object that
+    caps per-process memory and the number of live processes, and kills them
+    all when the job handle is closed. Returns the job handle, or None.
+    """
+    from ctypes import wintypes
+
+    class JOBOBJECT_BASIC_LIMIT_INFORMATION(ctypes.Structure):
+        _fields_ = [
+            ("PerProcessUserTimeLimit", ctypes.c_int64),
+            ("PerJobUserTimeLimit", ctypes.c_int64),
+            ("LimitFlags", wintypes.DWORD),
+            ("MinimumWorkingSetSize", ctypes.c_size_t),
+            ("MaximumWorkingSetSize", ctypes.c_size_t),
+            ("ActiveProcessLimit", wintypes.DWORD),
+            ("Affinity", ctypes.c_size_t),
+            ("PriorityClass", wintypes.DWORD),
+            ("SchedulingClass", wintypes.DWORD),
+        ]
+
+    class IO_COUNTERS(ctypes.Structure):
+        _fields_ = [(name, ctypes.c_uint64) for name in (
+            "ReadOperationCount", "WriteOperationCount", "OtherOperationCount",
+            "ReadTransferCount", "WriteTransferCount", "OtherTransferCount",
+        )]
+
+    class JOBOBJECT_EXTENDED_LIMIT_INFORMATION(ctypes.Structure):
+        _fields_ = [
+            ("BasicLimitInformation", JOBOBJECT_BASIC_LIMIT_INFORMATION),
+            ("IoInfo", IO_COUNTERS),
+            ("ProcessMemoryLimit", ctypes.c_size_t),
+            ("JobMemoryLimit", ctypes.c_size_t),
+            ("PeakProcessMemoryUsed", ctypes.c_size_t),
+            ("PeakJobMemoryUsed", ctypes.c_size_t),
+        ]
+
+    JOB_OBJECT_LIMIT_ACTIVE_PROCESS = 0x0008
+    JOB_OBJECT_LIMIT_PROCESS_MEMORY = 0x0100
+    JOB_OBJECT_LIMIT_KILL_ON_JOB_CLOSE = 0x2000
+    JobObjectExtendedLimitInformation = 9
+
+    kernel32 = ctypes.windll.kernel32
+    kernel32.CreateJobObjectW.restype = wintypes.HANDLE
+    job = kernel32.CreateJobObjectW(None, None)
+    if not job:
+        return None
+
+    info = JOBOBJECT_EXTENDED_LIMIT_INFORMATION()
+    info.BasicLimitInformation.LimitFlags = (
+        JOB_OBJECT_LIMIT_ACTIVE_PROCESS
+        | JOB_OBJECT_LIMIT_PROCESS_MEMORY
+        | JOB_OBJECT_LIMIT_KILL_ON_JOB_CLOSE
+    )
+    info.BasicLimitInformation.ActiveProcessLimit = SHELL_HOST_MAX_PROCESSES
+    info.ProcessMemoryLimit = SHELL_HOST_MAX_MEMORY
+    if not (kernel32.SetInformationJobObject(wintypes.HANDLE(job), JobObjectExtendedLimitInformation,
+                                             ctypes.byref(info), ctypes.sizeof(info))
+            and kernel32.AssignProcessToJobObject(wintypes.HANDLE(job), wintypes.HANDLE(int(handle)))):
+        kernel32.CloseHandle(wintypes.HANDLE(job))
+        return None
+    return job
+
+
+class ShellHost:
+    """
+    One long-lived shell process. Commands are written to its stdin followed
+    by a command that prints a unique sentinel line with the exit code, and
+    output is read back up to that sentinel. Each command runs in a subshell
+    (bash) or script block (PowerShell) so it can't change the host's state.
+    Hosts run under memory / CPU / process limits: ulimit in each bash
+    subshell, a Job Object on Windows.
+    """
+    def __init__(self, kind):
+        self.kind = kind
+        self.uses = 0
+        self.closed = False
+        self.started = time.monotonic()
+        self.sentinel = f"__COMMANDER_DONE_{uuid.uuid4().hex}__"
+        self.cwd = os.getcwd()
+        self.job = None
+
+        if kind == "bash":
+            argv = ["bash", "--noprofile", "--norc"]
+        elif kind == "powershell":
+            argv = ["powershell" if sys.platform == "win32" else "pwsh",
+                    "-NoLogo", "-NoProfile", "-NonInteractive", "-Command", "-"]
+        else:
+            argv = ["cmd.exe", "/Q", "/K"]
+
+        self.proc = subprocess.Popen(
+            argv,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            errors="replace",
+            bufsize=1,
+            creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
+            start_new_session=(sys.platform != "win32")
+        )
+        if sys.platform == "win32":
+            try:
+                self.job = _windows_job_object(self.proc._handle)
+            except (AttributeError, OSError):
+                pass
+        self._lines = queue.Queue()
+        threading.Thread(target=self._read_output, daemon=True).start()
+
+    def _read_output(self):
+        for line in self.proc.stdout:
+            self._lines.put(line)
+        self._lines.put(None)  # EOF: the host exited
+
+    def _wrap(self, script):
+        if self.kind == "bash":
+            # Limits are set inside the command's subshell, so they never touch
+            # the host. The soft CPU limit sends SIGXCPU ("CPU time limit
+            # exceeded") a few seconds before the hard one kills.
+            limits = (
+                f"ulimit -v {SHELL_HOST_MAX_MEMORY // 1024} -t {SHELL_HOST_MAX_CPU_SECONDS + 5}; "
+                f"ulimit -St {SHELL_HOST_MAX_CPU_SECONDS}"
+            )
+            quoted = script.replace("'", "'\\''")
+            return (
+                f"( {{ {limits}; }} 2>/dev/null; eval '{quoted}' ) </dev/null 2>&1; "
+                f"printf '%s %d\\n' '{self.sentinel}' $?\n"
+            )
+        if self.kind == "powershell":
+            encoded = base64.b64encode(script.encode("utf-8")).decode("ascii")
+            return (
+                "$global:LASTEXITCODE = 0; "
+                "try { & ([ScriptBlock]::Create([Text.Encoding]::UTF8.GetString("
+                f"[Convert]::FromBase64String('{encoded}')))) 2>&1 | Out-String -Stream; $code = $LASTEXITCODE }} "
+                "catch { $_ | Out-String; $code = 1 }; "
+                f"Write-Output \"{self.sentinel} $code\"\n"
+            )
+        # Lines go to cmd as typed, so % expands as in a console and a block
+        # such as "if (...) (" continues until its ")". cmd has no cheap
+        # subshell; put the working directory back afterwards
+        lines = "\r\n".join(line for line in script.splitlines() if line.strip())
+        return f"{lines}\r\necho {self.sentinel} %ERRORLEVEL%\r\ncd /d \"{self.cwd}\"\r\n"
+
+    def alive(self):
+        return not self.closed and self.proc.poll() is None
+
+    def expired(self):
+        return (
+            not self.alive()
+            or self.uses >= SHELL_HOST_MAX_USES
+            or time.monotonic() - self.started > SHELL_HOST_MAX_AGE
+        )
+
+    def run(self, script, timeout=CAPTURE_TIMEOUT):
+        """
+        Run one script and return a CommandResult. On timeout the whole host
+        is killed (and must not be reused); exit_code is then None.
+        """
+        self.uses += 1
+        started = time.monotonic()
+        output = []
+        exit_code = None
+
+        try:
+            self.proc.stdin.write(self._wrap(script))
+            self.proc.stdin.flush()
+        except OSError as e:
+            self.close()
+            return CommandResult(f"Shell host error: {e}", None, time.monotonic() - started, time.time(), None, None)
+
+        while True:
+            remaining = timeout - (time.monotonic() - started)
+            try:
+                line = self._lines.get(timeout=max(0.0, remaining))
+            except queue.Empty:
+                self.close()
+                output.append(f"\n[Killed after {timeout} seconds]")
+                break
+            if line is None:
+                output.append("\n[Shell host exited]")
+                break
+
+            marker = line.find(self.sentinel)
+            if marker >= 0:
+                output.append(line[:marker])
+                code = line[marker + len(self.sentinel):].strip()
+                exit_code = int(code) if code.lstrip("-").isdigit() else None
+                break
+            output.append(line)
+
+        return CommandResult("".join(output), exit_code, time.monotonic() - started, time.time(), None, None)
+
+    def close(self):
+        self.closed = True
+        try:
+            self.proc.stdin.close()
+        except OSError:
+            pass
+        kill_process_tree(self.proc)
+        if self.job:
+            ctypes.windll.kernel32.CloseHandle(ctypes.c_void_p(self.job))
+            self.job = None
+
+
+class ShellHostPool:
+    """
+    Keeps a few pre-started ShellHosts per shell kind. run() borrows an idle
+    host (or starts one if all are busy), and returns it afterwards unless it
+    has hit its use/age limit or timed out, in which case it is closed and a
+    fresh host is started in the background. Thread-safe.
+    """
+    def __init__(self, size=SHELL_POOL_SIZE):
+        self.size = size
+        self._idle = {}  # kind -> [ShellHost]
+        self._lock = threading.Lock()
+
+    def prewarm(self, kind):
+        threading.Thread(target=self._fill, args=(kind,), daemon=True).start()
+
+    def _fill(self, kind):
+        with self._lock:
+            missing = self.size - len(self._idle.get(kind, []))
+        for _ in range(missing):
+            try:
+                host = ShellHost(kind)
+            except OSError as e:
+                print(f"Could not start {kind} host:", e)
+                return
+            self._checkin(host)
+
+    def _checkout(self, kind):
+        with self._lock:
+            idle = self._idle.setdefault(kind, [])
+            while idle:
+                host = idle.pop()
+                if not host.expired():
+                    return host
+                host.close()
+        return ShellHost(kind)
+
+    def _checkin(self, host):
+        if host.expired():
+            host.close()
+            self.prewarm(host.kind)
+            return
+        with self._lock:
+            idle = self._idle.setdefault(host.kind, [])
+            if len(idle) < self.size:
+                idle.append(host)
+                return
+        host.close()  # extra host started while the pool was busy
+
+    def run(self, kind, script, timeout=CAPTURE_TIMEOUT):
+        try:
+            host = self._checkout(kind)
+        except OSError as e:
+            return CommandResult(f"Could not start {kind} host: {e}", None, 0.0, time.time(), None, None)
+        result = host.run(script, timeout)
+        self._checkin(host)
+        return result
+
+    def close_all(self):
+        with self._lock:
+            hosts = [host for idle in self._idle.values() for host in idle]
+            self._idle = {}
+        for host in hosts:
+            host.close()
+
+###############################################################################
+# Embedded scripts + content-addressed script cache
+###############################################################################
+
+SCRIPT_CACHE_FOLDER = "script_cache"
+SCRIPT_CACHE_MAX_FILES = 500
+SCRIPT_CACHE_MAX_BYTES = 50 * 1024 * 1024
+SCRIPT_CACHE_MAX_AGE = 30 * 24 * 60 * 60  # unused scripts are dropped at startup after 30 days
+SCRIPT_CACHE_TMP_GRACE = 10 * 60           # ... and half-written files after 10 minutes
+
+# script_type -> file extension
+SCRIPT_TYPES = {"powershell": ".ps1", "batch": ".bat", "bash": ".sh", "python": ".py"}
+
+# Placeholders inside script bodies must look like {name}, so PowerShell
+# blocks such as { $_.Name } and format strings like {0} are left alone
+SCRIPT_PLACEHOLDER_RE = r"{([A-Za-z_]\w*)}"
+
+SCRIPT_CACHE_NAME_RE = re.compile(r"^[0-9a-f]{32}\.\w+$")
+
+
+def script_template(body, script_type, names):
+    """
+    The body to cache for a script whose {name} placeholders (for each of
+    names) are filled at run time from leading arguments, one per name in
+    that order. The cached file is then the same for every input, and the
+    values typed at a prompt never reach the disk. Shell scripts read them
+    into COMMANDER_<name> variables; Python scripts substitute the text
+    when they start.
+    """
+    if not names:
+        return body
+    pattern = "{(" + "|".join(re.escape(name) for name in names) + ")}"
+    if script_type == "python":
+        count = len(names) + 1
+        return (
+            "import re as _re, sys as _sys\n"
+            f"_values = dict(zip({list(names)!r}, _sys.argv[1:{count}]))\n"
+            f"del _sys.argv[1:{count}]\n"
+            f"exec(compile(_re.sub({pattern!r}, lambda m: _values[m.group(1)], {body!r}), __file__, 'exec'))\n"
+        )
+
+    if script_type == "powershell":
+        reference = "${{COMMANDER_{}}}"
+        preamble = [f"$COMMANDER_{name} = $args[{i}]" for i, name in enumerate(names)]
+        preamble.append(f"$args = @($args | Select-Object -Skip {len(names)})")
+    elif script_type == "batch":
+        reference = "%COMMANDER_{}%"
+        preamble = []
+        for name in names:
+            preamble += [f'@set "COMMANDER_{name}=%~1"', "@shift"]
+    else:
+        reference = "${{COMMANDER_{}}}"
+        preamble = [f'COMMANDER_{name}="$1"; shift' for name in names]
+
+    body = re.sub(pattern, lambda m: reference.format(m.group(1)), body)
+    shebang = ""
+    if body.startswith("#!"):
+        shebang, _, body = body.partition("\n")
+        shebang += "\n"
+    return shebang + "\n".join(preamble) + "\n" + body
+
+
+def script_argv(script_type, path, args, keep_open=True):
+    """
+    The argument list that runs a cached script file with extra args.
+    keep_open=False is used for captured runs, which must exit on their own.
+    """
+    if script_type == "powershell":
+        return (["powershell"] + (["-NoExit"] if keep_open else [])
+                + ["-NoProfile", "-ExecutionPolicy", "Bypass", "-File", path] + args)
+    if script_type == "batch":
+        return ["cmd.exe", "/k" if keep_open else "/c", path] + args
+    if script_type == "bash":
+        return ["bash", path] + args
+    return ["python", path] + args
+
+
+def warm_host_script_file(script_type, path, args):
+    """
+    (shell_kind, script) that runs a cached script file inside a warm host,
+    or None if that script type has no warm host.
+    """
+    quoted_args = " ".join(shlex.quote(arg) for arg in args)
+    if script_type == "powershell":
+        return "powershell", f"& '{path}' {quoted_args}".rstrip()
+    if script_type == "bash":
+        return "bash", f". '{path}' {quoted_args}".rstrip()
+    if script_type == "batch" and sys.platform == "win32":
+        return "cmd", f'call "{path}" {" ".join(args)}'.rstrip()
+    return None
+
+
+class ScriptCache:
+    """
+    Writes each distinct script body once to <sha256>.<ext> in a managed
+    folder and reuses the file on later runs. Bodies already seen in this
+    session are found by a dict lookup, so large scripts aren't re-hashed
+    either. Files are touched on use and the least recently used ones are
+    evicted once the folder exceeds max_files or max_bytes.
+    """
+    def __init__(self, folder, max_files=SCRIPT_CACHE_MAX_FILES, max_bytes=SCRIPT_CACHE_MAX_BYTES):
+        self.folder = folder
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._files = OrderedDict()  # file name -> size, least recently used first
+        self._by_body = {}           # (body, ext) -> file name
+        self._lock = threading.Lock()
+
+    def cleanup(self, max_age=SCRIPT_CACHE_MAX_AGE):
+        """
+        Called at startup: drop files we didn't create, scripts unused for
+        max_age seconds and half-written files old enough that no other
+        instance can still be writing them, then enforce the size bounds.
+        """
+        try:
+            names = os.listdir(self.folder)
+        except OSError:
+            return
+
+        now = time.time()
+        entries = []
+        for name in names:
+            path = os.path.join(self.folder, name)
+            try:
+                st = os.stat(path)
+                if name.endswith(".tmp"):
+                    if now - st.st_mtime > SCRIPT_CACHE_TMP_GRACE:
+                        os.remove(path)
+                    continue
+                if not SCRIPT_CACHE_NAME_RE.match(name) or now - st.st_mtime > max_age:
+                    os.remove(path)
+                    continue
+            except OSError:
+                continue
+            entries.append((st.st_mtime, name, st.st_size))
+
+        with self._lock:
+            self._files.clear()
+            self._by_body.clear()
+            self.total_bytes = 0
+            for _, name, size in sorted(entries):
+                self._files[name] = size
+                self.total_bytes += size
+            self._evict()
+
+    def materialize(self, body, script_type):
+        """
+        Path of a file containing body, writing it only if it isn't cached yet.
+        """
+        ext = SCRIPT_TYPES.get(script_type, ".txt")
+        with self._lock:
+            name = self._by_body.get((body, ext))
+            if name is None:
+                data = body.encode("utf-8")
+                name = hashlib.sha256(data).hexdigest()[:32] + ext
+                self._by_body[(body, ext)] = name
+            else:
+                data = None
+
+            path = os.path.join(self.folder, name)
+            if name in self._files and os.path.exists(path):
+                self._files.move_to_end(name)
+                try:
+                    os.utime(path)  # keeps LRU order across restarts
+                except OSError:
+                    pass
+                return path
+
+            if data is None:
+                data = body.encode("utf-8")
+            os.makedirs(self.folder, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+            self.total_bytes += len(data) - self._files.pop(name, 0)
+            self._files[name] = len(data)
+            self._evict(keep=name)
+            return path
+
+    def _evict(self, keep=None):
+        while self._files and (len(self._files) > self.max_files or self.total_bytes > self.max_bytes):
+            name, size = next(iter(self._files.items()))
+            if name == keep:
+                break
+            del self._files[name]
+            self.total_bytes -= size
+            for key in [k for k, v in self._by_body.items() if v == name]:
+                del self._by_body[key]
+            try:
+                os.remove(os.path.join(self.folder, name))
+            except OSError:
+                pass
+
+###############################################################################
+# Scheduler (periodic / daily / delayed runs)
+###############################################################################
+
+SCHEDULE_MISSED_GRACE = 60            # seconds late before a run counts as missed
+SCHEDULE_MAX_SLEEP_MS = 60 * 60 * 1000  # re-check at least hourly (clock changes, sleep)
+DEFAULT_SCHEDULE_CONCURRENCY = 4
+
+SCHEDULE_KINDS = ("interval", "daily", "delay")
+SCHEDULE_MISSED_POLICIES = ("run_once", "skip")
+SCHEDULE_OVERLAP_POLICIES = ("skip", "queue", "allow")
+
+
+def shortcut_placeholders(shortcut):
+    """
+    Distinct placeholder names a 'requires_input' shortcut asks for, in
+    order: {name} tokens of the command, then of the script body.
+    """
+    if not shortcut.get("requires_input", False):
+        return []
+    return list(dict.fromkeys(
+        re.findall(r"{(.*?)}", shortcut.get("command", ""))
+        + re.findall(SCRIPT_PLACEHOLDER_RE, shortcut.get("script", ""))
+    ))
+
+
+def fill_placeholders(command, values, pattern=r"{(.*?)}"):
+    """
+    Substitute {placeholder} tokens from a dict without prompting.
+    Returns (command, missing_placeholder_names).
+    """
+    missing = []
+    for ph in re.findall(pattern, command):
+        if values.get(ph):
+            command = command.replace(f"{{{ph}}}", values[ph])
+        elif ph not in missing:
+            missing.append(ph)
+    return command, missing
+
+
+def schedule_due_time(job, now):
+    """
+    When the job should fire next, as a time.time() timestamp.
+    A time in the past means the run was missed (e.g. Commander was closed).
+    """
+    kind = job.get("kind", "interval")
+    base = job.get("last_fired") or job.get("created_at", now)
+
+    if kind == "delay":
+        return job.get("created_at", now) + job.get("delay", 0)
+
+    if kind == "daily":
+        hour, minute = (int(part) for part in job.get("time", "00:00").split(":"))
+        t = time.localtime(now)
+
+        def at_day(day_offset):
+            return time.mktime((t.tm_year, t.tm_mon, t.tm_mday + day_offset, hour, minute, 0, 0, 0, -1))
+
+        today = at_day(0)
+        previous = today if today <= now else at_day(-1)
+        if base < previous:
+            return previous
+        return today if today > now else at_day(1)
+
+    return base + max(1, job.get("interval", 60))
+
+
+def describe_schedule(job):
+    kind = job.get("kind", "interval")
+    if kind == "daily":
+        when = f"daily at {job.get('time', '00:00')}"
+    elif kind == "delay":
+        when = f"once, {job.get('delay', 0)}s after creation"
+    else:
+        when = f"every {job.get('interval', 60)}s"
+    return f"{when} (missed: {job.get('missed', 'run_once')}, overlap: {job.get('overlap', 'skip')})"
+
+
+class Scheduler:
+    """
+    Keeps every scheduled job in one min-heap ordered by due time, so a single
+    timer armed for next_due() drives any number of jobs and costs nothing
+    while idle. Removed or rescheduled jobs leave stale heap entries behind;
+    they are skipped lazily.
+    """
+    def __init__(self, missed_grace=SCHEDULE_MISSED_GRACE):
+        self.missed_grace = missed_grace
+        self.jobs = {}      # job_id -> job dict (the persisted form)
+        self._heap = []     # (due, job_id)
+        self._due = {}      # job_id -> due time of its live heap entry
+
+    def add(self, job, now=None):
+        now = time.time() if now is None else now
+        job.setdefault("id", uuid.uuid4().hex[:12])
+        job.setdefault("created_at", now)
+        self.jobs[job["id"]] = job
+        self._push(job, now)
+        return job
+
+    def remove(self, job_id):
+        self.jobs.pop(job_id, None)
+        self._due.pop(job_id, None)
+
+    def _push(self, job, now):
+        if not job.get("enabled", True):
+            self._due.pop(job["id"], None)
+            return
+        due = schedule_due_time(job, now)
+        self._due[job["id"]] = due
+        heapq.heappush(self._heap, (due, job["id"]))
+
+    def next_due(self):
+        while self._heap:
+            due, job_id = self._heap[0]
+            if self._due.get(job_id) == due:
+                return due
+            heapq.heappop(self._heap)  # stale entry
+        return None
+
+    def next_due_for(self, job_id):
+        return self._due.get(job_id)
+
+    def pop_due(self, now=None):
+        """
+        Returns the jobs that should run now and reschedules them.
+        Missed runs with the 'skip' policy are rescheduled without running;
+        'run_once' collapses any number of missed runs into a single run.
+        """
+        now = time.time() if now is None else now
+        fired = []
+
+        while True:
+            due = self.next_due()
+            if due is None or due > now:
+                break
+
+            _, job_id = heapq.heappop(self._heap)
+            del self._due[job_id]
+            job = self.jobs[job_id]
+            missed = now - due > self.missed_grace
+
+            job["last_fired"] = now
+            if job.get("kind") == "delay":
+                self.remove(job_id)  # one-shot
+            else:
+                self._push(job, now)
+
+            if missed and job.get("missed", "run_once") == "skip":
+                job["last_result"] = "missed (skipped)"
+                continue
+            fired.append(job)
+
+        return fired
+
+###############################################################################
+# Catalog index + search query language
+###############################################################################
+#
+# Query syntax (case-insensitive):
+#   ping google                 both words appear somewhere (name/command/tags/category)
+#   "ping google"               exact phrase
+#   tag:network                 has the tag "network"
+#   cat:Networking              category is "Networking" or any "Networking/..." below it
+#   group:"Startup Tools"       group is "Startup Tools"
+#   name:ping  cmd:ipconfig     substring of the name / command
+#   -tag:windows  NOT x         negation
+#   a OR b, (a OR b) c          boolean combinations (AND is implicit)
+
+QUERY_FIELD_ALIASES = {
+    "tag": "tag", "tags": "tag",
+    "cat": "cat", "category": "cat",
+    "group": "group",
+    "name": "name",
+    "cmd": "cmd", "command": "cmd",
+}
+INDEXED_QUERY_FIELDS = ("tag", "cat", "group")
+
+# CatalogIndex.add_many / remove_many: batches at least this big update the
+# sorted key arrays in one pass instead of one insort / del per entry
+INDEX_BATCH_MIN = 200
+
+QUERY_TOKEN_RE = re.compile(r'\s*(?:(-?\()|(\))|(-)?(?:(\w+):)?(?:"([^"]*)"?|([^\s()"]+)))')
+
+
+def category_key(category):
+    """
+    Normalized, lower-case form of a category path: "Networking / DNS/" -> "networking/dns".
+    """
+    return "/".join(part.strip() for part in category.split("/") if part.strip()).lower()
+
+
+class CatalogIndex:
+    """
+    Inverted indexes from category / tag / group to positions in shortcuts_data.
+    Kept up to date incrementally by add() / remove(), or add_many() /
+    remove_many() for batches; deleting shortcuts shifts positions, so
+    batches of deletes from the middle call rebuild() once.
+
+    Categories are paths ("Networking/DNS/Diagnostics"). Their keys are also
+    kept in one sorted list, so a whole subtree is a contiguous slice found
+    with two binary searches instead of a scan.
+
+    Names are kept in a sorted array of (key, word, position) for prefix
+    completion, with one key per word of the name ("ping google",
+    "google"), so typing any word of a name finds it.
+    """
+    def __init__(self, shortcuts=()):
+        self.rebuild(shortcuts)
+
+    def rebuild(self, shortcuts):
+        self.by_category = {}       # category_key -> set(positions)
+        self.category_keys = []     # sorted category_keys (for subtree ranges)
+        self.category_display = {}  # category_key -> path as the user typed it
+        self.by_tag = {}            # lower-case tag -> set(positions)
+        self.by_group = {}          # lower-case group -> set(positions)
+        self.name_keys = []         # sorted (name key, word number, position)
+        for pos, s in enumerate(shortcuts):
+            self._add_postings(pos, s)
+            self.name_keys.extend(self.name_entries(pos, s))
+        self.name_keys.sort()
+
+    @staticmethod
+    def keys_for(s):
+        return (
+            [("tag", tag.strip().lower()) for tag in s.get("tags", []) if tag.strip()]
+            + ([("group", s["group"].strip().lower())] if s.get("group", "").strip() else [])
+        )
+
+    def _postings(self, kind):
+        return {"tag": self.by_tag, "group": self.by_group}[kind]
+
+    @staticmethod
+    def name_entries(pos, s):
+        words = s.get("name", "").lower().split()
+        return [(" ".join(words[i:]), i, pos) for i in range(len(words))]
+
+    def add(self, pos, s):
+        self._add_postings(pos, s)
+        for entry in self.name_entries(pos, s):
+            bisect.insort(self.name_keys, entry)
+
+    def add_many(self, items):
+        """
+        add() for a list of (position, shortcut). Big batches append their
+        keys and sort each array once, which stays linear where an insort
+        per entry goes quadratic (e.g. importing 50k into 50k).
+        """
+        if len(items) < INDEX_BATCH_MIN:
+            for pos, s in items:
+                self.add(pos, s)
+            return
+        entries = []
+        new_categories = []
+        for pos, s in items:
+            self._add_postings(pos, s, new_categories)
+            entries.extend(self.name_entries(pos, s))
+        self.name_keys.extend(entries)
+        self.name_keys.sort()
+        if new_categories:
+            self.category_keys.extend(new_categories)
+            self.category_keys.sort()
+
+    def _add_postings(self, pos, s, new_categories=None):
+        """
+        new_categories collects categories seen for the first time instead
+        of inserting them into category_keys (add_many sorts them in later).
+        """
+        category = s.get("category", "")
+        key = category_key(category)
+        positions = self.by_category.get(key)
+        if positions is None:
+            positions = self.by_category[key] = set()
+            if new_categories is None:
+                bisect.insort(self.category_keys, key)
+            else:
+                new_categories.append(key)
+            self.category_display[key] = "/".join(part.strip() for part in category.split("/") if part.strip())
+        positions.add(pos)
+
+        for kind, key in self.keys_for(s):
+            self._postings(kind).setdefault(key, set()).add(pos)
+
+    def remove(self, pos, s):
+        for entry in self.name_entries(pos, s):
+            i = bisect.bisect_left(self.name_keys, entry)
+            if i < len(self.name_keys) and self.name_keys[i] == entry:
+                del self.name_keys[i]
+        self._remove_postings(pos, s)
+
+    def remove_many(self, items):
+        """
+        remove() for a list of (position, shortcut): big batches filter each
+        sorted array once instead of deleting entries one at a time.
+        """
+        if len(items) < INDEX_BATCH_MIN:
+            for pos, s in items:
+                self.remove(pos, s)
+            return
+        doomed = set()
+        emptied = set()
+        for pos, s in items:
+            doomed.update(self.name_entries(pos, s))
+            self._remove_postings(pos, s, emptied)
+        self.name_keys[:] = [entry for entry in self.name_keys if entry not in doomed]
+        if emptied:
+            self.category_keys[:] = [key for key in self.category_keys if key not in emptied]
+
+    def _remove_postings(self, pos, s, emptied=None):
+        """
+        emptied collects categories left with no shortcuts instead of
+        deleting them from category_keys (remove_many filters them out later).
+        """
+        key = category_key(s.get("category", ""))
+        positions = self.by_category.get(key)
+        if positions is not None:
+            positions.discard(pos)
+            if not positions:
+                del self.by_category[key]
+                del self.category_display[key]
+                if emptied is None:
+                    del self.category_keys[bisect.bisect_left(self.category_keys, key)]
+                else:
+                    emptied.add(key)
+
+        for kind, key in self.keys_for(s):
+            postings = self._postings(kind)
+            positions = postings.get(key)
+            if positions is not None:
+                positions.discard(pos)
+                if not positions:
+                    del postings[key]
+
+    def complete_name(self, prefix, limit=20, scan_limit=2000):
+        """
+        Positions of up to limit shortcuts with a name word starting with
+        prefix. Names that start with prefix come first, each group in
+        alphabetical order. At most scan_limit entries are looked at, so a
+        one-letter prefix on a huge catalog still answers instantly.
+        """
+        prefix = " ".join(prefix.lower().split())
+        start = bisect.bisect_left(self.name_keys, (prefix,))
+        starts_with = {}  # position -> whether the whole name starts with prefix
+        whole_count = 0
+        for key, word, pos in self.name_keys[start:start + scan_limit]:
+            if not key.startswith(prefix):
+                break
+            if word == 0:
+                whole_count += 1
+            starts_with[pos] = starts_with.get(pos, False) or word == 0
+            if whole_count >= limit:
+                break
+        whole = [pos for pos, is_whole in starts_with.items() if is_whole]
+        partial = [pos for pos, is_whole in starts_with.items() if not is_whole]
+        return (whole + partial)[:limit]
+
+    def descendant_range(self, path):
+        """
+        (lo, hi) slice of category_keys holding every key strictly below path.
+        Those keys all start with path + "/", and "0" sorts right after "/".
+        """
+        if not path:
+            return 0, len(self.category_keys)
+        lo = bisect.bisect_left(self.category_keys, path + "/")
+        hi = bisect.bisect_left(self.category_keys, path + "0", lo)
+        return lo, hi
+
+    def subtree_keys(self, path):
+        lo, hi = self.descendant_range(path)
+        keys = self.category_keys[lo:hi]
+        if path and path in self.by_category:
+            keys.append(path)
+        return keys
+
+    def subtree_count(self, path):
+        return sum(len(self.by_category[key]) for key in self.subtree_keys(path))
+
+    def has_subcategories(self, path):
+        lo, hi = self.descendant_range(path)
+        if not path:
+            return any(self.category_keys[lo:hi])  # "" (uncategorized) isn't a node
+        return hi > lo
+
+    def category_children(self, path):
+        """
+        Paths of the direct children of path ("" = top level), in sorted order.
+        """
+        lo, hi = self.descendant_range(path)
+        start = len(path) + 1 if path else 0
+        children = {}
+        for key in self.category_keys[lo:hi]:
+            if key:
+                segment = key[start:].split("/", 1)[0]
+                children[key[:start] + segment] = None
+        return list(children)
+
+    def display_name(self, path):
+        """
+        The path with the user's capitalization, also for intermediate nodes
+        that have no shortcuts of their own.
+        """
+        if path in self.category_display:
+            return self.category_display[path]
+        lo, hi = self.descendant_range(path)
+        if lo < hi:
+            depth = path.count("/") + 1
+            return "/".join(self.category_display[self.category_keys[lo]].split("/")[:depth])
+        return path
+
+    def lookup(self, field, value):
+        """
+        Positions whose field equals value (case-insensitive).
+        For categories this includes every sub-category.
+        """
+        if field == "tag":
+            return self.by_tag.get(value.strip().lower(), set())
+        if field == "group":
+            return self.by_group.get(value.strip().lower(), set())
+
+        keys = self.subtree_keys(category_key(value))
+        if len(keys) == 1:
+            return self.by_category[keys[0]]
+        return set().union(*(self.by_category[key] for key in keys))
+
+
+def parse_query(text):
+    """
+    Parse a search string into a small tree of tuples:
+      ("and", [nodes]) / ("or", [nodes]) / ("not", node)
+      ("field", field, value) / ("text", value)
+    Never raises: unknown fields are treated as plain text and stray
+    parentheses are ignored.
+    """
+    tokens = []
+    for match in QUERY_TOKEN_RE.finditer(text):
+        lparen, rparen, negate, field, quoted, bare = match.groups()
+        if lparen:
+            if lparen.startswith("-"):
+                tokens.append(("NOT",))
+            tokens.append(("(",))
+        elif rparen:
+            tokens.append((")",))
+        else:
+            value = quoted if quoted is not None else bare
+            if field and field.lower() not in QUERY_FIELD_ALIASES:
+                value, field = f"{field}:{value}", None
+            if not field and not negate and quoted is None and value in ("OR", "AND", "NOT"):
+                tokens.append((value,))
+                continue
+            if field:
+                field = QUERY_FIELD_ALIASES[field.lower()]
+                node = ("field", field, category_key(value) if field == "cat" else value.lower())
+            else:
+                node = ("text", value.lower())
+            tokens.append(("term", ("not", node) if negate else node))
+
+    pos = 0
+
+    def peek():
+        return tokens[pos][0] if pos < len(tokens) else None
+
+    def parse_or():
+        nonlocal pos
+        parts = [parse_and()]
+        while peek() == "OR":
+            pos += 1
+            parts.append(parse_and())
+        parts = [p for p in parts if p is not None]
+        if not parts:
+            return None
+        return parts[0] if len(parts) == 1 else ("or", parts)
+
+    def parse_and():
+        nonlocal pos
+        parts = []
+        while peek() not in (None, "OR", ")"):
+            if peek() == "AND":
+                pos += 1
+                continue
+            node = parse_unary()
+            if node is not None:
+                parts.append(node)
+        if not parts:
+            return None
+        return parts[0] if len(parts) == 1 else ("and", parts)
+
+    def parse_unary():
+        nonlocal pos
+        kind = peek()
+        pos += 1
+        if kind == "NOT":
+            while peek() == "AND":
+                pos += 1  # "NOT AND x" reads as "NOT x"
+            node = parse_unary() if peek() not in (None, "OR", ")") else None
+            return ("not", node) if node is not None else None
+        if kind == "(":
+            node = parse_or()
+            if peek() == ")":
+                pos += 1
+            return node
+        if kind == "term":
+            return tokens[pos - 1][1]
+        return None  # Operator with nothing to apply to
+
+    root = None
+    while pos < len(tokens):
+        node = parse_or()
+        if node is not None:
+            root = node if root is None else ("and", [root, node])
+        if peek() == ")":
+            pos += 1  # stray closing parenthesis
+    return root
+
+
+def query_candidates(node, index):
+    """
+    The planner: positions that can possibly match node, taken from the
+    indexes, or None if node can't be answered from an index. AND starts
+    from its most selective indexed child and intersects upwards.
+    """
+    if node is None:
+        return None
+
+    kind = node[0]
+    if kind == "field" and node[1] in INDEXED_QUERY_FIELDS:
+        return index.lookup(node[1], node[2])
+
+    if kind == "and":
+        sets = [c for c in (query_candidates(child, index) for child in node[1]) if c is not None]
+        if not sets:
+            return None
+        sets.sort(key=len)
+        result = set(sets[0])
+        for other in sets[1:]:
+            if not result:
+                break
+            result &= other
+        return result
+
+    if kind == "or":
+        sets = [query_candidates(child, index) for child in node[1]]
+        if any(c is None for c in sets):
+            return None
+        return set().union(*sets)
+
+    return None  # NOT and free text need a scan of the candidates
+
+
+def shortcut_search_text(s):
+    return " ".join([
+        s.get("name", ""),
+        s.get("command", ""),
+        " ".join(s.get("tags", [])),
+        s.get("category", "")
+    ]).lower()
+
+
+def query_matches(node, s):
+    """
+    Evaluate a parsed query against a single shortcut.
+    """
+    if node is None:
+        return True
+
+    kind = node[0]
+    if kind == "and":
+        return all(query_matches(child, s) for child in node[1])
+    if kind == "or":
+        return any(query_matches(child, s) for child in node[1])
+    if kind == "not":
+        return not query_matches(node[1], s)
+    if kind == "text":
+        return node[1] in shortcut_search_text(s)
+
+    field, value = node[1], node[2]
+    if field == "tag":
+        return any(tag.strip().lower() == value for tag in s.get("tags", []))
+    if field == "cat":
+        key = category_key(s.get("category", ""))
+        return key == value or key.startswith(value + "/")
+    if field == "group":
+        return s.get("group", "").strip().lower() == value
+    if field == "name":
+        return value in s.get("name", "").lower()
+    return value in s.get("command", "").lower()
+
+
+def run_query(node, index, shortcuts):
+    """
+    Positions of all shortcuts matching node, in catalog order. Only the
+    index candidates are checked against the full query, so selective
+    queries cost roughly the size of their result.
+    """
+    candidates = query_candidates(node, index)
+    positions = sorted(candidates) if candidates is not None else range(len(shortcuts))
+    return [pos for pos in positions if query_matches(node, shortcuts[pos])]
+
+###############################################################################
+# Undo / redo log
+###############################################################################
+
+UNDO_LIMIT = 200  # steps kept in each direction
+
+
+class UndoLog:
+    """
+    Bounded undo / redo stacks of catalog operations. Each entry is
+    (label, operation), where the operation undoes (or redoes) one change:
+
+      ("insert", [(position, shortcut), ...])  positions ascending
+      ("delete", [position, ...])
+      ("replace", {position: shortcut})
+
+    Shortcut dicts are never edited in place (edits build a new dict), so
+    entries just keep references to the old versions instead of copying
+    the catalog. Memory is bounded by UNDO_LIMIT steps per stack.
+    """
+    def __init__(self, limit=UNDO_LIMIT):
+        self.undo_stack = deque(maxlen=limit)
+        self.redo_stack = deque(maxlen=limit)
+
+    def record(self, label, operation):
+        """
+        A new change: it can be undone, and anything undone before can't be redone anymore.
+        """
+        self.undo_stack.append((label, operation))
+        self.redo_stack.clear()
+
+    def push_undo(self, label, operation):
+        self.undo_stack.append((label, operation))
+
+    def push_redo(self, label, operation):
+        self.redo_stack.append((label, operation))
+
+    def clear(self):
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+
+    def pop_undo(self):
+        return self.undo_stack.pop() if self.undo_stack else None
+
+    def pop_redo(self):
+        return self.redo_stack.pop() if self.redo_stack else None
+
+    def next_labels(self):
+        """
+        (label of the next undo, label of the next redo); None where empty.
+        """
+        return (
+            self.undo_stack[-1][0] if self.undo_stack else None,
+            self.redo_stack[-1][0] if self.redo_stack else None
+        )
+
+###############################################################################
+# Theme toggle switch
+###############################################################################
+
+class ThemeToggleSwitch(QCheckBox):
+    """
+    A QCheckBox styled as a small toggle switch.
+    We'll rely on toggled(bool) to know if it's ON (dark) or OFF (light).
+    """
+    def __init__(self, parent=None, checked=False):
+        super().__init__(parent)
+        self.setChecked(checked)
+        self.setText("")  # No label text
+        self.setCursor(Qt.PointingHandCursor)
+        self.setStyleSheet(TOGGLE_SWITCH_QSS)
+
+    def on_link_file(self):
+        """
+        Let the user pick a .bat or .ps1 file and store that path in self.command_edit.
+        """
+        file_filter = "Scripts (*.bat *.ps1);;All Files (*)"
+        file_path, _ = QFileDialog.getOpenFileName(self, "Select Script", "", file_filter)
+        if file_path:
+            self.command_edit.setText(file_path)
+
+    def on_ok_clicked(self):
+        """
+        Gather all data, store in self.result_data, and accept the dialog.
+        """
+        name = self.name_edit.text().strip()
+        command = self.command_edit.text().strip()
+        description = self.description_edit.text().strip()
+        tags_str = self.tags_edit.text().strip()
+        category = self.category_edit.text().strip()
+
+        # Convert tags to a list
+        if tags_str:
+            tags_list = [tag.strip() for tag in tags_str.split(",")]
+        else:
+            tags_list = []
+
+        self.result_data = {
+            "name": name,
+            "command": command,
+            "description": description,
+            "tags": tags_list,
+            "category": category
+        }
+        self.accept()
+    
+    def get_data(self):
+        """
+        Returns the final data from the dialog as a dict.
+        """
+        return self.result_data
+    
+###############################################################################
+# Standard Windows Admin-check logic (if you're still using admin re-launch)
+###############################################################################
+
+def is_user_admin():
+    """
+    Returns True if the current Python process is running with admin privileges (Windows).
+    """
+    try:
+        return ctypes.windll.shell32.IsUserAnAdmin()
+    except:
+        return False
+
+
+def relaunch_as_admin():
+    """
+    Relaunches the current script with admin rights via ShellExecuteW.
+    Returns True if relaunch was attempted, False if already admin or any error occurred.
+    """
+    if is_user_admin():
+        return False  # already admin
+
+    try:
+        # Re-run the script with 'runas' param
+        params = " ".join(sys.argv[1:])  # pass existing command line args if needed
+        ctypes.windll.shell32.ShellExecuteW(None, "runas", sys.executable, sys.argv[0] + " " + params, None, 1)
+        return True
+    except Exception as e:
+        print("Failed to elevate:", e)
+        return False
+    
+###############################################################################
+# Commander Class
+###############################################################################
+
+class Commander(QMainWindow):
+    def __init__(self, json_path="shortcuts.json"):
+        super().__init__()
+        # Relative paths (like the default) are next to main.py / the .exe
+        self.json_path = os.path.join(get_app_folder(), json_path)
+        self.shortcuts_data = []
+
+        # Sharing shortcuts.json with other instances (see save_shortcuts)
+        self.synced_versions = {}         # uid -> version last seen in the file
+        self.dirty_uids = set()           # uids added / edited / deleted here since the last save
+        self.catalog_fingerprint = None   # file_fingerprint() after our last read or write
+        self.catalog_conflicts = {}       # uid -> (mine, theirs) waiting for the user
+        self.pending_catalog = None       # merged records, shown once the current change is done
+        self.conflict_dialog_open = False
+        self.sync_timer = QTimer(self)
+        self.sync_timer.timeout.connect(self.on_sync_timer)
+
+        # This new list will store (shortcut, original_index) for the currently displayed table rows
+        self.displayed_pairs = []
+
+        # Set a default theme before initializing the UI
+        self.current_theme = "light"  # Default to light theme
+
+        # Track which category is selected (None => show all)
+        self.selected_category = None
+
+        # Window Title & Initial Size
+        self.setWindowTitle("Commander")
+        self.setMinimumSize(800, 400)
+        self.resize(1000, 600)
+
+        # Keep track of two-step confirm state
+        self.confirmation_pending = False
+
+        # Captured results of 'cache_output' shortcuts, keyed by final command
+        self.result_cache = ResultCache()
+        self.pending_captures = {}  # command -> CommandRunner still running
+        self.output_dialogs = {}    # command -> open CommandOutputDialog
+
+        # Pre-started shells for 'warm_host' shortcuts
+        self.shell_pool = ShellHostPool()
+
+        # Embedded script bodies, written once per distinct content
+        self.script_cache = ScriptCache(os.path.join(os.path.dirname(self.json_path), SCRIPT_CACHE_FOLDER))
+        self.script_cache.cleanup()
+
+        # Per-run metrics (wall time, exit code, peak RSS, CPU time)
+        self.run_history = RunHistory(os.path.join(os.path.dirname(self.json_path), RUN_HISTORY_FILE))
+
+        # Scheduled runs: one heap + one timer for every job
+        self.settings_data = {}
+        self.scheduler = Scheduler()
+        self.schedule_timer = QTimer(self)
+        self.schedule_timer.setSingleShot(True)
+        self.schedule_timer.timeout.connect(self.on_schedule_timer)
+        self.schedule_running = {}      # job_id -> runs started or waiting for a slot
+        self.schedule_deferred = set()  # job_ids with a queued overlapping run
+        self.schedule_waiting = deque() # (job, shortcut) waiting for a concurrency slot
+        self.schedule_active = 0        # scheduled processes currently running
+        self.schedule_draining = False  # drain_schedule_waiting is on the stack
+        self.settings_dirty = False     # schedule results / placeholder history changed since last save
+
+        # Inverse operations for undo / redo of catalog changes
+        self.undo_log = UndoLog()
+
+        # Search: parsed query cache + category/tag/group indexes
+        self._parsed_query_text = None
+        self._parsed_query = None
+
+        # Startup: phase -> seconds, printed once the whole catalog is shown
+        self.startup_timings = OrderedDict([("import", IMPORTS_FINISHED - STARTUP_STARTED)])
+        self.startup_pending = True  # finish_startup() hasn't run yet
+
+        # Rows still waiting to be filled in by the table fill timer
+        self.table_fill_row = 0
+        self.table_fill_timer = QTimer(self)
+        self.table_fill_timer.timeout.connect(self.fill_table_chunk)
+
+        started = time.perf_counter()
+        self.load_shortcuts()
+        self.startup_timings["load"] = time.perf_counter() - started
+
+        # Built right after the first paint (see finish_startup)
+        self.catalog_index = None
+
+        started = time.perf_counter()
+        self.initUI()
+        self.apply_theme(self.current_theme)  # Apply the loaded theme after UI initialization
+
+        # Initially show all shortcuts; only the first screenful is filled now
+        pairs = [(s, i) for i, s in enumerate(self.shortcuts_data)]
+        self.populate_table(pairs, first_rows=FIRST_PAINT_ROWS)
+        self.startup_timings["build UI"] = time.perf_counter() - started
+
+        # The first paint normally finishes startup; a window that never
+        # paints still needs its scheduler, sync timer and warm hosts
+        QTimer.singleShot(STARTUP_FALLBACK_MS, self.ensure_started)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.startup_pending and "first paint" not in self.startup_timings:
+            self.startup_timings["first paint"] = time.perf_counter() - STARTUP_STARTED
+            QTimer.singleShot(0, self.finish_startup)
+
+    def finish_startup(self):
+        """
+        The part of startup that can wait until the window has painted:
+        search indexes, the category sidebar, the rest of the table, the
+        scheduler and warm shell hosts. Anything that needs the index before
+        then calls this directly (see ensure_started).
+        """
+        if not self.startup_pending:
+            return
+        self.startup_pending = False
+
+        started = time.perf_counter()
+        self.catalog_index = CatalogIndex(self.shortcuts_data)
+        self.startup_timings["index"] = time.perf_counter() - started
+
+        self.update_category_sidebar()
+
+        # Start the scheduler (runs anything missed while Commander was closed)
+        self.arm_schedule_timer()
+
+        # Warm up a shell host for each kind of shell the opt-in shortcuts use
+        self.prewarm_shell_hosts()
+
+        # Watch for other instances writing the same shortcuts.json
+        self.sync_timer.start(CATALOG_SYNC_INTERVAL_MS)
+
+        if self.table_fill_row < len(self.displayed_pairs):
+            self.table_fill_timer.start(0)
+        else:
+            self.on_table_filled()
+
+    def ensure_started(self):
+        if self.startup_pending:
+            self.finish_startup()
+
+    def startup_report(self):
+        """
+        One line, e.g. "Startup: import 95 ms, load 4 ms, build UI 30 ms, ...".
+        'first paint' and 'full catalog' are measured from process start.
+        """
+        parts = [f"{phase} {seconds * 1000:.0f} ms" for phase, seconds in self.startup_timings.items()]
+        return "Startup: " + ", ".join(parts)
+
+    def prewarm_shell_hosts(self):
+        kinds = {
+            self.warm_host_kind(s)
+            for s in self.shortcuts_data if s.get("warm_host", False)
+        }
+        for kind in kinds - {None}:
+            self.shell_pool.prewarm(kind)
+
+    def warm_host_kind(self, shortcut):
+        if shortcut.get("script"):
+            found = warm_host_script_file(shortcut.get("script_type", "powershell"), "", [])
+            return found[0] if found else None
+        return warm_host_script(shortcut.get("command", ""))[0]
+
+    ###########################################################################
+    # SIDEBAR / CATEGORY
+    ###########################################################################
+    def category_item_text(self, path):
+        if path is None:
+            return f"(All Categories) ({len(self.shortcuts_data)})"
+        name = self.catalog_index.display_name(path).rsplit("/", 1)[-1]
+        return f"{name} ({self.catalog_index.subtree_count(path)})"
+
+    def add_category_items(self, parent_item, path):
+        """
+        Add one tree item per direct child of path. Grandchildren are only
+        created when the user expands a child (see on_category_expanded).
+        """
+        for child_path in self.catalog_index.category_children(path):
+            item = QTreeWidgetItem([self.category_item_text(child_path)])
+            item.setData(0, Qt.UserRole, child_path)
+            if self.catalog_index.has_subcategories(child_path):
+                item.setChildIndicatorPolicy(QTreeWidgetItem.ShowIndicator)
+            if parent_item is None:
+                self.category_tree.addTopLevelItem(item)
+            else:
+                parent_item.addChild(item)
+            self.category_items[child_path] = item
+
+    def on_category_expanded(self, item):
+        path = item.data(0, Qt.UserRole)
+        if path is not None and path not in self.loaded_category_paths:
+            self.loaded_category_paths.add(path)
+            self.add_category_items(item, path)
+
+    def update_category_sidebar(self):
+        """
+        Refresh the category tree. It is only rebuilt when the set of category
+        paths changed; otherwise just the counts of the loaded items are updated.
+        Includes an '(All Categories)' item to reset filter.
+        """
+        keys = self.catalog_index.category_keys
+        if self.category_tree.topLevelItemCount() and keys == self.sidebar_category_keys:
+            self.all_categories_item.setText(0, self.category_item_text(None))
+            for path, item in self.category_items.items():
+                item.setText(0, self.category_item_text(path))
+            return
+
+        expanded = [path for path, item in self.category_items.items() if item.isExpanded()]
+        self.sidebar_category_keys = list(keys)
+        self.category_items = {}
+        self.loaded_category_paths = set()
+
+        self.category_tree.clear()
+
+        # Add an item to show all categories
+        self.all_categories_item = QTreeWidgetItem([self.category_item_text(None)])
+        self.all_categories_item.setData(0, Qt.UserRole, None)
+        self.category_tree.addTopLevelItem(self.all_categories_item)
+
+        # Add the top-level categories; deeper levels load on expand
+        self.add_category_items(None, "")
+
+        # Restore what was expanded (parents first, so children exist)
+        for path in sorted(expanded, key=lambda p: p.count("/")):
+            if path in self.category_items:
+                self.category_items[path].setExpanded(True)
+
+        selected_item = self.category_items.get(self.selected_category)
+        if selected_item is not None:
+            self.category_tree.setCurrentItem(selected_item)
+
+    def on_category_selected(self, item, column=0):
+        """
+        Called when the user clicks a category in the sidebar.
+        If '(All Categories)', reset self.selected_category to None.
+        Otherwise, set self.selected_category to the category path, which
+        filters to that category and everything below it.
+        Then call filter_table().
+        """
+        self.selected_category = item.data(0, Qt.UserRole)
+        self.filter_table()
+
+    ###########################################################################
+    # UI SETUP
+    ###########################################################################
+    def initUI(self):
+        central_widget = QWidget()
+        self.setCentralWidget(central_widget)
+
+        # Create the main horizontal layout
+        main_layout = QHBoxLayout()
+        central_widget.setLayout(main_layout)
+
+        # Create the splitter
+        splitter = QSplitter(Qt.Horizontal)
+
+        # 1) Left Sidebar: Category List
+        self.category_tree = QTreeWidget()
+        self.category_tree.setHeaderHidden(True)
+        self.category_tree.itemClicked.connect(self.on_category_selected)
+        self.category_tree.itemExpanded.connect(self.on_category_expanded)
+        self.category_items = {}            # category path -> loaded QTreeWidgetItem
+        self.loaded_category_paths = set()  # paths whose children have been created
+        self.sidebar_category_keys = None
+        # We'll call update_category_sidebar() after load_shortcuts to fill it
+
+        splitter.addWidget(self.category_tree)  # Add the category tree to the splitter
+
+        # 2) Right Panel
+        right_panel = QVBoxLayout()
+
+        # ========== Search Row ==========
+        search_layout = QHBoxLayout()
+        search_label = QLabel("Search:")
+        self.search_bar = QLineEdit()
+        self.search_bar.setPlaceholderText('Search... e.g. tag:network -tag:windows group:"Startup Tools" ping')
+        self.search_bar.setClearButtonEnabled(True)
+        self.search_bar.textChanged.connect(self.filter_table)
+
+        search_layout.addWidget(search_label)
+        search_layout.addWidget(self.search_bar)
+
+        # Add the toggle switch to the same row
+        self.theme_toggle_switch = ThemeToggleSwitch(checked=(self.current_theme == "dark"))
+        self.theme_toggle_switch.toggled.connect(self.on_theme_switch_toggled)
+        search_layout.addWidget(self.theme_toggle_switch)
+
+        right_panel.addLayout(search_layout)
+
+        # ========== Table ==========
+        self.table = QTableWidget()
+        self.table.setColumnCount(4)
+        self.table.setHorizontalHeaderLabels(["Name", "Command", "Tags", "Category"])
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.setSelectionMode(QTableWidget.ExtendedSelection)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.itemSelectionChanged.connect(self.on_table_selection_changed)
+        right_panel.addWidget(self.table)
+
+        # ========== CRUD + Bottom Layout ==========
+        bottom_layout = QHBoxLayout()
+
+        # Execute Button
+        self.execute_button = QPushButton("Execute")
+        self.execute_button.setEnabled(False)
+        self.execute_button.clicked.connect(self.on_execute_clicked)
+
+        # CRUD Buttons (Add, Edit, Delete)
+        crud_layout = QHBoxLayout()
+
+        self.add_button = QPushButton("Add Shortcut")
+        self.add_button.clicked.connect(self.on_add_shortcut)
+        crud_layout.addWidget(self.add_button)
+
+        self.edit_button = QPushButton("Edit Shortcut")
+        self.edit_button.clicked.connect(self.on_edit_shortcut)
+        self.edit_button.setEnabled(False)
+        crud_layout.addWidget(self.edit_button)
+
+        self.delete_button = QPushButton("Delete Shortcut")
+        self.delete_button.clicked.connect(self.on_delete_shortcut)
+        self.delete_button.setEnabled(False)
+        crud_layout.addWidget(self.delete_button)
+
+        # Bulk actions for multi-row selections
+        self.bulk_button = QPushButton("Bulk Actions")
+        bulk_menu = QMenu(self.bulk_button)
+        bulk_menu.addAction("Set Category...", self.on_bulk_set_category)
+        bulk_menu.addAction("Add Tags...", self.on_bulk_add_tags)
+        bulk_menu.addAction("Remove Tags...", self.on_bulk_remove_tags)
+        bulk_menu.addSeparator()
+        bulk_menu.addAction("Fan Out Over Values...", self.on_fan_out)
+        bulk_menu.addSeparator()
+        bulk_menu.addAction("Delete Selected", self.on_delete_shortcut)
+        self.bulk_button.setMenu(bulk_menu)
+        self.bulk_button.setEnabled(False)
+        crud_layout.addWidget(self.bulk_button)
+
+        self.schedules_button = QPushButton("Schedules...")
+        self.schedules_button.clicked.connect(self.on_manage_schedules)
+        crud_layout.addWidget(self.schedules_button)
+
+        self.history_button = QPushButton("History...")
+        self.history_button.clicked.connect(self.on_show_history)
+        crud_layout.addWidget(self.history_button)
+
+        self.import_button = QPushButton("Import...")
+        self.import_button.clicked.connect(self.on_import_shortcuts)
+        crud_layout.addWidget(self.import_button)
+
+        self.undo_button = QPushButton("Undo")
+        self.undo_button.clicked.connect(self.on_undo)
+        crud_layout.addWidget(self.undo_button)
+
+        self.redo_button = QPushButton("Redo")
+        self.redo_button.clicked.connect(self.on_redo)
+        crud_layout.addWidget(self.redo_button)
+        self.update_undo_buttons()
+
+        # Ctrl+P / Ctrl+K: run a shortcut by name without the mouse
+        QShortcut(QKeySequence("Ctrl+P"), self, activated=self.on_command_palette)
+        QShortcut(QKeySequence("Ctrl+K"), self, activated=self.on_command_palette)
+
+        # Ctrl+Z / Ctrl+Y (Ctrl+Shift+Z); the search bar keeps its own text undo
+        QShortcut(QKeySequence("Ctrl+Z"), self, activated=self.on_undo)
+        QShortcut(QKeySequence("Ctrl+Y"), self, activated=self.on_redo)
+        QShortcut(QKeySequence("Ctrl+Shift+Z"), self, activated=self.on_redo)
+
+        right_panel.addLayout(crud_layout)
+
+        # Info Label
+        self.info_label = QLabel("")
+        self.info_label.setStyleSheet(
+            "color: #333333;" if self.current_theme == "light" else "color: #dddddd;"
+        )
+
+        bottom_layout.addWidget(self.execute_button)
+        bottom_layout.addWidget(self.info_label)
+
+        right_panel.addLayout(bottom_layout)
+
+        # Wrap the right panel layout in a QWidget
+        right_panel_widget = QWidget()
+        right_panel_widget.setLayout(right_panel)
+
+        # Add the right panel widget to the splitter
+        splitter.addWidget(right_panel_widget)
+
+        # Set initial sizes or stretch factors
+        splitter.setStretchFactor(0, 0)  # Left pane does not expand as much
+        splitter.setStretchFactor(1, 1)  # Right pane expands more
+
+        # Set default sizes (adjust as needed for your desired ratio)
+        splitter.setSizes([150, 400])  # Left panel starts with 1/3 width, right panel 2/3
+        
+        # Add the splitter to the main layout
+        main_layout.addWidget(splitter)
+
+        # The category sidebar is filled in by finish_startup()
+
+    ###########################################################################
+    # THEME LOGIC
+    ###########################################################################
     def apply_theme(self, theme_name):
         """Applies the specified theme stylesheet to the QApplication."""
         if theme_name == "dark":
@@ -518,37 +2593,262 @@ class Commander(QMainWindow):
         """
         if os.path.exists(self.json_path):
             try:
+                self.catalog_fingerprint = file_fingerprint(self.json_path)
                 with open(self.json_path, 'r', encoding='utf-8') as f:
                     data = json.load(f)
                 self.shortcuts_data = data.get("shortcuts", [])
                 self.settings_data = data.get("settings", {})
                 self.current_theme = self.settings_data.get("theme", "light")
 
+                for job in data.get("schedules", []):
+                    self.scheduler.add(job)
+
                 if not self.shortcuts_data:
-                    self.shortcuts_data = self.get_default_shortcuts()
+                    self.shortcuts_data = self.new_records(self.get_default_shortcuts())
+                elif not self.has_unique_uids(self.shortcuts_data):
+                    self.stamp_catalog_records()
 
             except json.JSONDecodeError:
-                self.shortcuts_data = self.get_default_shortcuts()
+                self.shortcuts_data = self.new_records(self.get_default_shortcuts())
                 self.settings_data = {}
                 self.current_theme = "light"
         else:
-            self.shortcuts_data = self.get_default_shortcuts()
+            self.shortcuts_data = self.new_records(self.get_default_shortcuts())
             self.settings_data = {}
             self.current_theme = "light"
             self.save_shortcuts()
 
-        # Apply the loaded theme right away
-        self.apply_theme(self.current_theme)
+        self.synced_versions = {
+            s["uid"]: s.get("version", 0) for s in self.shortcuts_data if s["uid"] not in self.dirty_uids
+        }
+
+    @staticmethod
+    def has_unique_uids(records):
+        uids = {s.get("uid") for s in records}
+        return None not in uids and len(uids) == len(records)
+
+    def new_records(self, shortcuts, taken=()):
+        """
+        Copies of shortcuts with a fresh uid (unless they already have one
+        that isn't taken) and version 0, marked dirty so the next save
+        writes them.
+        """
+        records = []
+        for s in shortcuts:
+            if not s.get("uid") or s["uid"] in taken:
+                s = dict(s, uid=new_record_uid(), version=0)
+            records.append(s)
+            self.dirty_uids.add(s["uid"])
+        return records
+
+    def stamp_catalog_records(self):
+        """
+        Give every record of an older shortcuts.json a uid and version, and
+        write that back right away. Done under the lock and from a fresh read,
+        so instances started together agree on the uids.
+        """
+        try:
+            with CatalogLock(self.json_path):
+                data = read_catalog_file(self.json_path) or {"shortcuts": self.shortcuts_data}
+                records = data["shortcuts"]
+                if not self.has_unique_uids(records):
+                    seen = set()
+                    stamped = []
+                    for s in records:
+                        if not s.get("uid") or s["uid"] in seen:
+                            s = dict(s, uid=new_record_uid(), version=1)
+                        seen.add(s["uid"])
+                        stamped.append(s)
+                    records = stamped
+                    atomic_write_json(self.json_path, dict(data, shortcuts=records))
+                self.catalog_fingerprint = file_fingerprint(self.json_path)
+        except (CatalogLockTimeout, OSError) as e:
+            print(f"Could not stamp {self.json_path}: {e}")
+            records = self.new_records(self.shortcuts_data)
+        self.shortcuts_data = records
 
     def save_shortcuts(self):
-        data_to_save = {
-            "shortcuts": self.shortcuts_data,
-            "settings": {
-                "theme": self.current_theme
-            }
-        }
-        with open(self.json_path, 'w', encoding='utf-8') as f:
-            json.dump(data_to_save, f, indent=2)
+        """
+        Write this instance's changes to shortcuts.json, which other Commanders
+        may share. Under the file lock: if the file is unchanged since our last
+        read or write (the usual case), our records are written as they are.
+        Otherwise only the records changed here (dirty_uids) are merged into
+        what's on disk (see merge_catalog), and everyone else's changes are
+        picked up. Conflicting edits stay out of the file and are shown to the
+        user. Settings and schedules are this instance's (last writer wins).
+        """
+        disk_changed = False
+        try:
+            with CatalogLock(self.json_path):
+                data = None
+                if file_fingerprint(self.json_path) != self.catalog_fingerprint:
+                    data = read_catalog_file(self.json_path)
+                if not data or not data["shortcuts"]:
+                    # Unchanged since we last synced, or missing / corrupt /
+                    # empty: there's nothing to merge with, so write ours as is
+                    records = self.stamp_dirty_versions()
+                    conflicts = []
+                elif not self.has_unique_uids(data["shortcuts"]):
+                    # Another instance is still stamping an older file; keep
+                    # our changes dirty and let the next sync tick retry
+                    raise OSError("shortcuts.json is being upgraded by another Commander")
+                else:
+                    records, conflicts = merge_catalog(
+                        data["shortcuts"], self.shortcuts_data, self.dirty_uids, self.synced_versions
+                    )
+                    disk_changed = True
+
+                data_to_save = {
+                    "shortcuts": records,
+                    "settings": dict(self.settings_data, theme=self.current_theme),
+                    "schedules": list(self.scheduler.jobs.values())
+                }
+                atomic_write_json(self.json_path, data_to_save)
+                self.catalog_fingerprint = file_fingerprint(self.json_path)
+        except (CatalogLockTimeout, OSError) as e:
+            # Nothing is lost: dirty records stay dirty and go out with the next save
+            print(f"Could not save {self.json_path}: {e}")
+            if hasattr(self, "info_label"):
+                self.info_label.setText(f"Not saved yet: {e}")
+            return
+
+        for uid in self.dirty_uids:
+            self.catalog_conflicts.pop(uid, None)  # changed again here = resolved
+        self.dirty_uids.clear()
+        self.settings_dirty = False
+        self.synced_versions = {s["uid"]: s.get("version", 0) for s in records}
+
+        if disk_changed:
+            self.catalog_conflicts.update({uid: (mine, theirs) for uid, mine, theirs in conflicts})
+            self.adopt_disk_records(records)
+        if self.catalog_conflicts:
+            QTimer.singleShot(0, self.show_catalog_conflicts)
+
+    def stamp_dirty_versions(self):
+        """
+        Fast path of save_shortcuts: bump the version of each dirty record
+        in place (same positions, so nothing else needs updating) and
+        return the records to write.
+        """
+        if self.dirty_uids:
+            for pos, s in enumerate(self.shortcuts_data):
+                if s["uid"] in self.dirty_uids:
+                    self.shortcuts_data[pos] = dict(s, version=self.synced_versions.get(s["uid"], 0) + 1)
+        return list(self.shortcuts_data)
+
+    def adopt_disk_records(self, records):
+        """
+        Make the merged file contents our catalog, keeping our side of any
+        unresolved conflict. If that changes anything beyond version stamps,
+        the switch happens on the next event loop pass (apply_pending_catalog),
+        after the change that triggered the save has updated the view.
+        """
+        memory = []
+        for s in records:
+            conflict = self.catalog_conflicts.get(s["uid"])
+            if conflict is None:
+                memory.append(s)
+            elif conflict[0] is not None:
+                memory.append(conflict[0])
+        on_disk = {s["uid"] for s in records}
+        memory.extend(
+            mine for uid, (mine, theirs) in self.catalog_conflicts.items()
+            if mine is not None and uid not in on_disk
+        )
+
+        unchanged = len(memory) == len(self.shortcuts_data) and all(
+            a is b or same_record(a, b) for a, b in zip(memory, self.shortcuts_data)
+        )
+        if unchanged:
+            self.shortcuts_data[:] = memory  # New version stamps only
+            return
+        if self.pending_catalog is None:
+            QTimer.singleShot(0, self.apply_pending_catalog)
+        self.pending_catalog = memory
+
+    def modal_dialog_open(self):
+        """
+        True while a modal dialog (confirm box, input prompt, editor...) runs
+        its own event loop. Callers like on_delete_shortcut hold catalog
+        positions across it, so the catalog must not be swapped meanwhile.
+        """
+        return QApplication.activeModalWidget() is not None
+
+    def apply_pending_catalog(self):
+        if self.pending_catalog is not None and self.modal_dialog_open():
+            QTimer.singleShot(CATALOG_SYNC_INTERVAL_MS, self.apply_pending_catalog)
+            return
+        memory, self.pending_catalog = self.pending_catalog, None
+        if memory is None:
+            return
+        self.shortcuts_data[:] = memory
+        if self.catalog_index is None:
+            return  # finish_startup() builds the index and sidebar from this
+
+        # Positions moved, so steps recorded before no longer line up
+        self.undo_log.clear()
+        self.update_undo_buttons()
+
+        self.catalog_index.rebuild(self.shortcuts_data)
+        self.filter_table()
+        self.update_category_sidebar()
+        self.info_label.setText("Picked up changes from another Commander.")
+
+    def on_sync_timer(self):
+        """
+        Every few seconds: if another instance wrote shortcuts.json, pick up
+        its changes. A stat() is all this costs while nothing changes.
+        """
+        if self.pending_catalog is not None or self.modal_dialog_open():
+            return
+        if file_fingerprint(self.json_path) == self.catalog_fingerprint:
+            return
+        if self.dirty_uids:
+            self.save_shortcuts()  # An earlier save failed; merge and retry now
+            return
+
+        fingerprint = file_fingerprint(self.json_path)
+        data = read_catalog_file(self.json_path)
+        if not data or not data["shortcuts"]:
+            return  # Missing, corrupt or empty: keep ours, the next save rewrites it
+        records = data["shortcuts"]
+        if not self.has_unique_uids(records):
+            return  # Mid-migration; try again later
+        self.catalog_fingerprint = fingerprint
+        self.synced_versions = {s["uid"]: s.get("version", 0) for s in records}
+        self.adopt_disk_records(records)
+
+    def show_catalog_conflicts(self):
+        if not self.catalog_conflicts or self.conflict_dialog_open:
+            return
+        self.conflict_dialog_open = True
+        dialog = CatalogConflictDialog(self, self.catalog_conflicts)
+        accepted = dialog.exec_() == QDialog.Accepted
+        self.conflict_dialog_open = False
+        if not accepted:
+            return  # Decide later: the dialog comes back after the next save
+
+        keep_mine = False
+        memory = list(self.shortcuts_data)
+        for uid, choice in dialog.get_choices().items():
+            mine, theirs = self.catalog_conflicts.pop(uid)
+            if choice == "mine":
+                # Overwrite their version (synced_versions already has it)
+                self.dirty_uids.add(uid)
+                keep_mine = True
+                continue
+            positions = [pos for pos, s in enumerate(memory) if s["uid"] == uid]
+            if theirs is None:
+                memory = [s for s in memory if s["uid"] != uid]
+            elif positions:
+                memory[positions[0]] = theirs
+            else:
+                memory.append(theirs)
+
+        self.pending_catalog = memory
+        self.apply_pending_catalog()
+        if keep_mine:
+            self.save_shortcuts()
 
     def get_default_shortcuts(self):
         return [
@@ -578,85 +2878,197 @@ class Commander(QMainWindow):
     ###########################################################################
     # TABLE LOGIC
     ###########################################################################
-    def populate_table(self, pairs):
+    def set_table_row(self, row_idx, shortcut):
+        """
+        Fill one table row from a shortcut dict.
+        """
+        name = shortcut.get("name", "")
+        command = shortcut.get("command", "")
+        if shortcut.get("script"):
+            command = f"[{shortcut.get('script_type', 'powershell')} script] {command}".rstrip()
+        description = shortcut.get("description", "")
+        tags = ", ".join(shortcut.get("tags", []))
+        category = shortcut.get("category", "")
+
+        item_name = QTableWidgetItem(name)
+        item_command = QTableWidgetItem(command)
+        item_tags = QTableWidgetItem(tags)
+        item_category = QTableWidgetItem(category)
+
+        if description:
+            item_name.setToolTip(description)
+            item_command.setToolTip(description)
+            item_tags.setToolTip(description)
+            item_category.setToolTip(description)
+
+        self.table.setItem(row_idx, 0, item_name)
+        self.table.setItem(row_idx, 1, item_command)
+        self.table.setItem(row_idx, 2, item_tags)
+        self.table.setItem(row_idx, 3, item_category)
+
+    def populate_table(self, pairs, first_rows=None):
         """
         pairs is a list of (shortcut_dict, original_index).
         We'll store it in self.displayed_pairs so we know how to map
         row -> original index in self.shortcuts_data.
+        With first_rows, only that many rows are filled now and the rest
+        are filled in chunks by the table fill timer.
         """
         self.displayed_pairs = pairs  # store for later reference
+        self.table_fill_timer.stop()
+        self.table_fill_row = len(pairs) if first_rows is None else min(first_rows, len(pairs))
+
+        # Avoid a repaint per cell when filling large tables
+        self.table.setUpdatesEnabled(False)
         self.table.setRowCount(len(pairs))
 
-        for row_idx, (shortcut, orig_idx) in enumerate(pairs):
-            name = shortcut.get("name", "")
-            command = shortcut.get("command", "")
-            description = shortcut.get("description", "")
-            tags = ", ".join(shortcut.get("tags", []))
-            category = shortcut.get("category", "")
-
-            item_name = QTableWidgetItem(name)
-            item_command = QTableWidgetItem(command)
-            item_tags = QTableWidgetItem(tags)
-            item_category = QTableWidgetItem(category)
-
-            if description:
-                item_name.setToolTip(description)
-                item_command.setToolTip(description)
-                item_tags.setToolTip(description)
-                item_category.setToolTip(description)
-
-            self.table.setItem(row_idx, 0, item_name)
-            self.table.setItem(row_idx, 1, item_command)
-            self.table.setItem(row_idx, 2, item_tags)
-            self.table.setItem(row_idx, 3, item_category)
+        for row_idx, (shortcut, orig_idx) in enumerate(pairs[:self.table_fill_row]):
+            self.set_table_row(row_idx, shortcut)
 
         self.table.resizeColumnsToContents()
+        self.table.setUpdatesEnabled(True)
 
-    ###########################################################################
-    # SEARCH LOGIC
-    ###########################################################################
-    def filter_table(self):
-        filter_text = self.search_bar.text().lower().strip()
-        pairs = []
+        if self.table_fill_row < len(pairs) and not self.startup_pending:
+            self.table_fill_timer.start(0)
 
-        for i, s in enumerate(self.shortcuts_data):
-            # 1) If we have a selected_category, skip items that don't match it
-            if self.selected_category:
-                if s.get("category", "") != self.selected_category:
-                    continue
+    def fill_table_chunk(self):
+        """
+        Fill the next TABLE_FILL_CHUNK rows left empty by populate_table(first_rows=...).
+        """
+        end = min(self.table_fill_row + TABLE_FILL_CHUNK, len(self.displayed_pairs))
+        self.table.setUpdatesEnabled(False)
+        for row_idx in range(self.table_fill_row, end):
+            self.set_table_row(row_idx, self.displayed_pairs[row_idx][0])
+        self.table.setUpdatesEnabled(True)
+        self.table_fill_row = end
+
+        if end >= len(self.displayed_pairs):
+            self.table_fill_timer.stop()
+            self.on_table_filled()
+
+    def finish_table_fill(self):
+        """
+        Fill any rows still pending right away (before rows are removed or moved).
+        """
+        while self.table_fill_row < len(self.displayed_pairs):
+            self.fill_table_chunk()
 
-            # 2) If we have a filter_text, skip items that don't contain it
-            if filter_text:
-                combined_text = " ".join([
-                    s.get("name", ""),
-                    s.get("command", ""),
-                    " ".join(s.get("tags", [])),
-                    s.get("category", "")
-                ]).lower()
-                if filter_text not in combined_text:
-                    continue
+    def on_table_filled(self):
+        if "full catalog" not in self.startup_timings:
+            self.startup_timings["full catalog"] = time.perf_counter() - STARTUP_STARTED
+            print(self.startup_report())
+
+    def remove_table_rows(self, rows):
+        """
+        Remove the given table rows (and their displayed_pairs entries).
+        A contiguous tail (e.g. undoing an import) is cut off in one call, a
+        few scattered rows are removed in place, and many scattered rows
+        rebuild the table, since removeRow shifts every row below it.
+        """
+        rows = sorted(set(rows))
+        if not rows:
+            return
+
+        start = rows[0]
+        if len(rows) == len(self.displayed_pairs) - start:
+            self.table.setRowCount(start)
+            del self.displayed_pairs[start:]
+            self.table_fill_row = min(self.table_fill_row, start)
+            return
+
+        if len(rows) > TABLE_REMOVE_ROWS_MAX:
+            doomed = set(rows)
+            self.populate_table(
+                [pair for row, pair in enumerate(self.displayed_pairs) if row not in doomed],
+                first_rows=FIRST_PAINT_ROWS
+            )
+            return
+
+        self.table.setUpdatesEnabled(False)
+        for row in reversed(rows):
+            self.table.removeRow(row)
+            del self.displayed_pairs[row]
+        self.table.setUpdatesEnabled(True)
+        # Rows not filled yet moved up along with the filled ones
+        self.table_fill_row -= bisect.bisect_left(rows, self.table_fill_row)
 
-            pairs.append((s, i))
+    ###########################################################################
+    # SEARCH LOGIC
+    ###########################################################################
+    def active_query(self):
+        """
+        The parsed search bar query, combined with the selected sidebar category.
+        Parsing is cached per search text.
+        """
+        text = self.search_bar.text().strip()
+        if text != self._parsed_query_text:
+            self._parsed_query_text = text
+            self._parsed_query = parse_query(text)
+
+        query = self._parsed_query
+        if self.selected_category:
+            category_node = ("field", "cat", self.selected_category)
+            query = category_node if query is None else ("and", [category_node, query])
+        return query
+
+    def matches_filter(self, s, query=None):
+        """
+        True if shortcut s passes the selected category and the search query.
+        """
+        if query is None:
+            query = self.active_query()
+        return query_matches(query, s)
 
-        self.populate_table(pairs)
+    def filter_table(self):
+        self.ensure_started()
+        positions = run_query(self.active_query(), self.catalog_index, self.shortcuts_data)
+        self.populate_table([(self.shortcuts_data[i], i) for i in positions])
 
     ###########################################################################
     # TABLE SELECTION (Enabling Execute, Edit, Delete)
     ###########################################################################
-    def on_table_select(self, row, column):
-        self.execute_button.setEnabled(True)
+    def selected_rows(self):
+        """
+        Sorted table rows that are currently selected.
+        """
+        return sorted(index.row() for index in self.table.selectionModel().selectedRows())
+
+    def selected_original_indices(self):
+        """
+        Indices into self.shortcuts_data for every selected row, in table order.
+        """
+        return [self.displayed_pairs[row][1] for row in self.selected_rows()]
+
+    def on_table_selection_changed(self):
+        rows = self.selected_rows()
+
         self.execute_button.setText("Execute")
         self.confirmation_pending = False
 
+        if not rows:
+            self.execute_button.setEnabled(False)
+            self.execute_button.setStyleSheet("")
+            self.edit_button.setEnabled(False)
+            self.delete_button.setEnabled(False)
+            self.bulk_button.setEnabled(False)
+            return
+
+        self.execute_button.setEnabled(True)
+
         # Make it red
         self.execute_button.setStyleSheet("background-color: red; color: white;")
 
-        self.edit_button.setEnabled(True)
+        # Editing only makes sense for one shortcut; everything else works on many
+        self.edit_button.setEnabled(len(rows) == 1)
         self.delete_button.setEnabled(True)
+        self.bulk_button.setEnabled(True)
 
-        item_name = self.table.item(row, 0).text()
-        item_command = self.table.item(row, 1).text()
-        self.info_label.setText(f"Selected: {item_name} | Command: {item_command}")
+        if len(rows) == 1:
+            # From displayed_pairs: rows past table_fill_row have no items yet
+            shortcut = self.displayed_pairs[rows[0]][0]
+            self.info_label.setText(f"Selected: {shortcut.get('name', '')} | Command: {shortcut.get('command', '')}")
+        else:
+            self.info_label.setText(f"Selected {len(rows)} shortcuts (Execute runs all of them)")
 
     ###########################################################################
     # TWO-STEP EXECUTION
@@ -674,44 +3086,96 @@ class Commander(QMainWindow):
             self.execute_button.setStyleSheet("background-color: red; color: white;")
 
     def run_selected_command(self):
-        selected_items = self.table.selectedItems()
-        if not selected_items:
-            return  # No selection
-
-        row = selected_items[0].row()
-        shortcut, original_index = self.displayed_pairs[row]
+        """
+        Run every selected shortcut, in table order.
+        """
+        for original_index in self.selected_original_indices():
+            self.run_shortcut(self.shortcuts_data[original_index])
 
+    def resolve_command(self, shortcut, values=None):
+        """
+        Returns the shortcut's command with every {placeholder} filled in,
+        or None if the user cancelled a prompt. Placeholders already in
+        values (e.g. typed into the command palette) aren't prompted for.
+        For script shortcuts this is the cached script's path followed by
+        its placeholder values and arguments.
+        """
         command = shortcut.get("command", "").strip()
-        requires_input = shortcut.get("requires_input", False)
-
-        # 1) Placeholder handling
-        if requires_input:
-            placeholders = re.findall(r"{(.*?)}", command)
-            if placeholders:
-                for ph in placeholders:
-                    val = self.prompt_for_variable(ph)
-                    if not val:
-                        self.info_label.setText("Command cancelled or no input provided.")
-                        return
-                    # Replace placeholders
-                    command = command.replace(f"{{{ph}}}", val)
-
-        # 2) Parse the final command string into tokens with shlex
+
+        # Placeholder handling (each distinct name is asked for once)
+        placeholders = shortcut_placeholders(shortcut)
+        filled = {}
+        if placeholders:
+            values = values or {}
+            for ph in placeholders:
+                val = values.get(ph) or self.prompt_for_variable(ph)
+                if not val:
+                    self.info_label.setText("Command cancelled or no input provided.")
+                    return None
+                filled[ph] = val
+                self.remember_placeholder_value(ph, val)
+            # Replace placeholders
+            command, _ = fill_placeholders(command, filled)
+
+        return self.script_command(shortcut, filled, command)
+
+    def script_command(self, shortcut, values, args):
+        """
+        For script shortcuts, write the body to the script cache with its
+        placeholders left for run time (see script_template) and return
+        "<path> <placeholder values> <args>". Plain shortcuts get args back
+        unchanged.
+        """
+        if not shortcut.get("script"):
+            return args
+        try:
+            tokens = shlex.split(args)
+        except ValueError as e:
+            self.info_label.setText(f"Shlex parse error: {e}")
+            return None
+        script = shortcut["script"]
+        script_type = shortcut.get("script_type", "powershell")
+        names = [name for name in dict.fromkeys(re.findall(SCRIPT_PLACEHOLDER_RE, script)) if values.get(name)]
+        try:
+            path = self.script_cache.materialize(script_template(script, script_type, names), script_type)
+        except OSError as e:
+            self.info_label.setText(f"Could not write script: {e}")
+            return None
+        return shlex.join([path] + [values[name] for name in names] + tokens)
+
+    def full_command(self, shortcut, command, keep_open=True):
+        """
+        The argument list for a resolved command: script shortcuts run their
+        cached file with the matching interpreter, everything else goes
+        through build_full_command.
+        """
+        if not shortcut.get("script"):
+            return self.build_full_command(command, keep_open)
+        tokens = shlex.split(command)
+        return script_argv(shortcut.get("script_type", "powershell"), tokens[0], tokens[1:], keep_open)
+
+    def build_full_command(self, command, keep_open=True):
+        """
+        Parse the final command string with shlex and decide how to run it.
+        keep_open=False uses 'cmd /c' instead of 'cmd /k' so captured runs exit.
+        Returns the argument list, or None if the command can't be parsed.
+        """
+        # 1) Parse the final command string into tokens with shlex
         try:
             tokens = shlex.split(command)
         except ValueError as e:
             # If there's a quoting error, or user typed something unparseable
             self.info_label.setText(f"Shlex parse error: {e}")
-            return
+            return None
 
         if not tokens:
             self.info_label.setText("No command tokens found.")
-            return
+            return None
 
         # For debugging: print(tokens)
         print("Parsed tokens:", tokens)
 
-        # 3) Decide how to run
+        # 2) Decide how to run
         first_token_lower = tokens[0].lower()
 
         # A) If first token ends with .exe, run it directly
@@ -726,29 +3190,429 @@ class Commander(QMainWindow):
             # e.g. user typed "powershell -File something.ps1"
             full_cmd = tokens
         else:
-            # C) Default: pass tokens to cmd /k
+            # C) Default: pass tokens to cmd /k (or /c when capturing)
             # i.e. run cmd, /k, and then your tokens as arguments
-            full_cmd = ["cmd.exe", "/k"] + tokens
+            full_cmd = ["cmd.exe", "/k" if keep_open else "/c"] + tokens
 
         print("Final cmd to execute:", full_cmd)
+        return full_cmd
+
+    def run_shortcut(self, shortcut, values=None):
+        command = self.resolve_command(shortcut, values)
+        if command is None:
+            return
+
+        # Cached diagnostics and warm-host shortcuts are captured and shown
+        # in an output window instead of a console
+        if shortcut.get("cache_output", False) or shortcut.get("warm_host", False):
+            self.run_captured_command(shortcut, command)
+            return
+
+        full_cmd = self.full_command(shortcut, command)
+        if full_cmd is None:
+            return
 
-        # 4) Execute
+        # Execute
         try:
-            subprocess.Popen(full_cmd, shell=False)
+            started_at, started = time.time(), time.monotonic()
+            proc = subprocess.Popen(full_cmd, shell=False)
         except Exception as e:
             print(f"Error executing command: {full_cmd}, Error: {e}")
             self.info_label.setText(f"Error executing: {e}")
+            return
+
+        # A console kept open by 'cmd /k' or '-NoExit' only exits when the user
+        # closes it, and its numbers would be the console's, not the command's
+        if stays_open(full_cmd):
+            return
+
+        # Record the run's metrics once it exits, without blocking the UI
+        threading.Thread(
+            target=self.watch_process,
+            args=(shortcut.get("name", ""), command, proc, started_at, started),
+            daemon=True
+        ).start()
+
+    def watch_process(self, name, command, proc, started_at, started):
+        """
+        Runs on a worker thread: waits for a launched process and records its metrics.
+        """
+        exit_code, peak_rss_kb, cpu_time = wait_and_measure(proc)
+        self.run_history.record(
+            RunRecord(name, command, started_at, time.monotonic() - started, exit_code, peak_rss_kb, cpu_time)
+        )
+
+    def record_captured_run(self, shortcut, command, result):
+        self.run_history.record(RunRecord(
+            shortcut.get("name", ""), command, result.finished_at - result.duration,
+            result.duration, result.exit_code, result.peak_rss_kb, result.cpu_time
+        ))
+
+    ###########################################################################
+    # CAPTURED EXECUTION (cached results, warm shell hosts)
+    ###########################################################################
+    def capture_task(self, shortcut, command):
+        """
+        A callable that runs command to completion and returns a CommandResult:
+        in a warm shell host for 'warm_host' shortcuts, otherwise as a fresh
+        process. Returns None if the command can't be parsed.
+        """
+        if shortcut.get("warm_host", False):
+            if shortcut.get("script"):
+                tokens = shlex.split(command)
+                found = warm_host_script_file(shortcut.get("script_type", "powershell"), tokens[0], tokens[1:])
+            else:
+                found = warm_host_script(command)
+            if found:  # No warm host for this script type: run it as a process
+                kind, script = found
+                return lambda: self.shell_pool.run(kind, script)
+
+        full_cmd = self.full_command(shortcut, command, keep_open=False)
+        if full_cmd is None:
+            return None
+        return lambda: run_captured(full_cmd)
+
+    def run_captured_command(self, shortcut, command, refresh=False):
+        """
+        For 'cache_output' shortcuts, show a fresh cached result for this exact
+        command if there is one. Otherwise capture a new run in the background
+        (and cache it). refresh=True always starts a new run.
+        Returns False if nothing was shown or started (e.g. the command
+        can't be parsed), so no result will follow.
+        """
+        if not refresh and shortcut.get("cache_output", False):
+            cached = self.result_cache.get(command)
+            if cached is not None:
+                result, seconds_left = cached
+                self.show_command_output(shortcut, command, result, seconds_left)
+                self.info_label.setText(f"Showing cached result for: {command}")
+                return True
+
+        if command in self.pending_captures:
+            return True  # Already running; its result will show up when done
+
+        task = self.capture_task(shortcut, command)
+        if task is None:
+            return False
+
+        runner = CommandRunner(task, parent=self)
+        runner.finished.connect(
+            lambda result: self.on_captured_command_finished(shortcut, command, runner, result)
+        )
+        self.pending_captures[command] = runner
+        runner.start()
+        self.info_label.setText(f"Running: {command}")
+        return True
+
+    def on_captured_command_finished(self, shortcut, command, runner, result):
+        self.pending_captures.pop(command, None)
+        runner.deleteLater()
+        self.record_captured_run(shortcut, command, result)
+
+        seconds_left = 0
+        if shortcut.get("cache_output", False) and result.exit_code is not None:
+            seconds_left = shortcut.get("cache_ttl", DEFAULT_CACHE_TTL)
+            self.result_cache.put(command, result, seconds_left)
+
+        self.show_command_output(shortcut, command, result, seconds_left)
+        self.info_label.setText(f"Finished: {command} (exit code {result.exit_code})")
+
+    def show_command_output(self, shortcut, command, result, seconds_left):
+        dialog = self.output_dialogs.get(command)
+        if dialog is None:
+            dialog = CommandOutputDialog(
+                self, shortcut.get("name", ""), command,
+                on_refresh=lambda: self.run_captured_command(shortcut, command, refresh=True)
+            )
+            dialog.finished.connect(lambda _: self.output_dialogs.pop(command, None))
+            self.output_dialogs[command] = dialog
+
+        dialog.set_result(result, seconds_left)
+        dialog.show()
+        dialog.raise_()
+
+    def prompt_for_variable(self, placeholder_label: str = "value"):
+        text, ok = QInputDialog.getText(
+            self,
+            "Input Required",
+            f"Enter {placeholder_label}:",
+            QLineEdit.Normal
+        )
+        if ok and text.strip():
+            return text.strip()
+        return None
+
+    def placeholder_history(self, placeholder):
+        """
+        Values entered for this placeholder before, most recent first.
+        """
+        return self.settings_data.get("placeholder_history", {}).get(placeholder, [])
+
+    def remember_placeholder_value(self, placeholder, value):
+        history = self.settings_data.setdefault("placeholder_history", {})
+        values = history.get(placeholder, [])
+        if values[:1] != [value]:
+            history[placeholder] = ([value] + [v for v in values if v != value])[:PLACEHOLDER_HISTORY_SIZE]
+            self.settings_dirty = True
+
+    ###########################################################################
+    # COMMAND PALETTE
+    ###########################################################################
+    def on_command_palette(self):
+        self.ensure_started()
+        CommandPaletteDialog(self).exec_()
+
+    def palette_matches(self, text, limit=PALETTE_MAX_RESULTS):
+        """
+        Shortcuts whose name has a word starting with text, best first.
+        """
+        return [self.shortcuts_data[pos] for pos in self.catalog_index.complete_name(text, limit)]
+
+    ###########################################################################
+    # BATCHED CHANGES (one save + one incremental view update per batch)
+    ###########################################################################
+    def add_shortcuts(self, new_shortcuts, undo_label="add"):
+        """
+        Append new shortcuts, save once and append only the matching rows to the table.
+        """
+        start = len(self.shortcuts_data)
+        return self.insert_shortcuts(
+            [(start + offset, s) for offset, s in enumerate(new_shortcuts)], undo_label
+        )
+
+    def insert_shortcuts(self, items, undo_label="add"):
+        """
+        items is a list of (position, shortcut dict) in ascending position
+        order; each shortcut ends up at that position in shortcuts_data.
+        Saves once and inserts only the matching rows into the table.
+        Returns the inverse operation (see UndoLog).
+        """
+        self.ensure_started()
+        if not items:
+            return None
+
+        # New shortcuts get a uid; restored ones (undo) keep theirs
+        taken = {s["uid"] for s in self.shortcuts_data}
+        items = list(zip([pos for pos, _ in items], self.new_records([s for _, s in items], taken)))
+
+        # Old position each new shortcut goes in front of
+        insert_points = [pos - offset for offset, (pos, _) in enumerate(items)]
+        at_end = insert_points[0] == len(self.shortcuts_data)
+
+        if at_end:
+            self.shortcuts_data.extend(s for _, s in items)
+        else:
+            merged, prev = [], 0
+            for point, (_, s) in zip(insert_points, items):
+                merged.extend(self.shortcuts_data[prev:point])
+                merged.append(s)
+                prev = point
+            merged.extend(self.shortcuts_data[prev:])
+            self.shortcuts_data[:] = merged
+        self.save_shortcuts()
+
+        if at_end:
+            self.catalog_index.add_many(items)
+        else:
+            # Positions after the first inserted entry all shift, so rebuild once
+            self.catalog_index.rebuild(self.shortcuts_data)
+            self.displayed_pairs[:] = [
+                (s, i + bisect.bisect_right(insert_points, i)) for s, i in self.displayed_pairs
+            ]
+
+        query = self.active_query()
+        self.insert_table_rows([(s, pos) for pos, s in items if self.matches_filter(s, query)])
+
+        # Also update the sidebar (maybe new category was added)
+        self.update_category_sidebar()
+
+        inverse = ("delete", [pos for pos, _ in items])
+        self.record_undo(undo_label, [s for _, s in items], inverse)
+        return inverse
+
+    def replace_shortcuts(self, replacements, undo_label="edit"):
+        """
+        replacements maps original_index -> new shortcut dict.
+        Saves once, then refreshes only the affected rows. Rows that no
+        longer match the current filter are dropped from the table, and
+        ones that now match are added.
+        Returns the inverse operation (see UndoLog).
+        """
+        self.ensure_started()
+        if not replacements:
+            return None
+
+        replacements = dict(replacements)
+        previous = {}
+        for original_index, shortcut in list(replacements.items()):
+            previous[original_index] = self.shortcuts_data[original_index]
+            if "uid" not in shortcut:
+                shortcut = replacements[original_index] = dict(shortcut, uid=previous[original_index]["uid"])
+            self.dirty_uids.add(shortcut["uid"])
+            self.shortcuts_data[original_index] = shortcut
+        self.catalog_index.remove_many(list(previous.items()))
+        self.catalog_index.add_many(list(replacements.items()))
+        self.save_shortcuts()
+
+        query = self.active_query()
+        rows_to_remove = []
+        shown = set()
+        for row, (_, original_index) in enumerate(self.displayed_pairs):
+            shortcut = replacements.get(original_index)
+            if shortcut is None:
+                continue
+            shown.add(original_index)
+            if self.matches_filter(shortcut, query):
+                self.displayed_pairs[row] = (shortcut, original_index)
+                self.set_table_row(row, shortcut)
+            else:
+                rows_to_remove.append(row)
+        self.remove_table_rows(rows_to_remove)
+        self.insert_table_rows([
+            (shortcut, original_index) for original_index, shortcut in replacements.items()
+            if original_index not in shown and self.matches_filter(shortcut, query)
+        ])
+
+        # Also update sidebar if a category changed
+        self.update_category_sidebar()
+
+        inverse = ("replace", previous)
+        self.record_undo(undo_label, list(replacements.values()), inverse)
+        return inverse
+
+    def delete_shortcuts(self, original_indices, undo_label="delete"):
+        """
+        Delete many shortcuts in one pass, save once and remove only their rows.
+        Returns the inverse operation (see UndoLog).
+        """
+        self.ensure_started()
+        doomed = sorted(set(original_indices))
+        if not doomed:
+            return None
+        doomed_set = set(doomed)
+        removed = [(i, self.shortcuts_data[i]) for i in doomed]
+        self.dirty_uids.update(s["uid"] for _, s in removed)
+        at_end = doomed[0] == len(self.shortcuts_data) - len(doomed)
+
+        self.shortcuts_data[:] = [
+            s for i, s in enumerate(self.shortcuts_data) if i not in doomed_set
+        ]
+        self.save_shortcuts()
+
+        if at_end:
+            # Nothing after the deleted entries, so no positions shift
+            self.catalog_index.remove_many(removed)
+        else:
+            # Positions after the first deleted entry all shift, so rebuild once
+            self.catalog_index.rebuild(self.shortcuts_data)
+
+        rows_to_remove = [
+            row for row, (_, original_index) in enumerate(self.displayed_pairs)
+            if original_index in doomed_set
+        ]
+        self.remove_table_rows(rows_to_remove)
+
+        # Surviving rows shift down by the number of deleted entries before them
+        self.displayed_pairs = [
+            (s, i - bisect.bisect_left(doomed, i)) for s, i in self.displayed_pairs
+        ]
+
+        # Also refresh sidebar in case we removed the last item of a category
+        self.update_category_sidebar()
+
+        inverse = ("insert", removed)
+        self.record_undo(undo_label, [s for _, s in removed], inverse)
+        return inverse
+
+    def insert_table_rows(self, pairs):
+        """
+        Insert (shortcut, original_index) pairs at their place in the table,
+        which lists shortcuts in catalog order.
+        """
+        if not pairs:
+            return
+        pairs = sorted(pairs, key=lambda pair: pair[1])
+        self.table.setUpdatesEnabled(False)
+
+        if not self.displayed_pairs or pairs[0][1] > self.displayed_pairs[-1][1]:
+            # All after the last shown row (e.g. newly added): append in one go
+            first_row = self.table.rowCount()
+            self.displayed_pairs.extend(pairs)
+            self.table.setRowCount(first_row + len(pairs))
+            if self.table_fill_row < first_row:
+                # The table fill timer hasn't got this far; it fills these too
+                if not self.table_fill_timer.isActive():
+                    self.table_fill_timer.start(0)
+            else:
+                for offset, (s, _) in enumerate(pairs):
+                    self.set_table_row(first_row + offset, s)
+                self.table_fill_row = len(self.displayed_pairs)
+        else:
+            self.finish_table_fill()
+            shown = [i for _, i in self.displayed_pairs]
+            for s, i in pairs:
+                row = bisect.bisect_left(shown, i)
+                shown.insert(row, i)
+                self.displayed_pairs.insert(row, (s, i))
+                self.table.insertRow(row)
+                self.set_table_row(row, s)
+
+        self.table.setUpdatesEnabled(True)
+
+    ###########################################################################
+    # UNDO / REDO
+    ###########################################################################
+    def record_undo(self, label, shortcuts, inverse):
+        """
+        Push the inverse of a change onto the undo stack. label=None means
+        the change is itself an undo / redo and is not recorded.
+        """
+        if label is None:
+            return
+        if len(shortcuts) == 1:
+            label = f"{label} '{shortcuts[0].get('name', '')}'"
+        else:
+            label = f"{label} {len(shortcuts)} shortcuts"
+        self.undo_log.record(label, inverse)
+        self.update_undo_buttons()
 
-    def prompt_for_variable(self, placeholder_label: str = "value"):
-        text, ok = QInputDialog.getText(
-            self,
-            "Input Required",
-            f"Enter {placeholder_label}:",
-            QLineEdit.Normal
-        )
-        if ok and text.strip():
-            return text.strip()
-        return None
+    def apply_catalog_operation(self, operation):
+        """
+        Apply an UndoLog operation without recording it; returns its inverse.
+        """
+        kind, payload = operation
+        if kind == "insert":
+            return self.insert_shortcuts(payload, undo_label=None)
+        if kind == "delete":
+            return self.delete_shortcuts(payload, undo_label=None)
+        return self.replace_shortcuts(payload, undo_label=None)
+
+    def on_undo(self):
+        entry = self.undo_log.pop_undo()
+        if entry is None:
+            self.info_label.setText("Nothing to undo.")
+            return
+        label, operation = entry
+        self.undo_log.push_redo(label, self.apply_catalog_operation(operation))
+        self.update_undo_buttons()
+        self.info_label.setText(f"Undid {label}")
+
+    def on_redo(self):
+        entry = self.undo_log.pop_redo()
+        if entry is None:
+            self.info_label.setText("Nothing to redo.")
+            return
+        label, operation = entry
+        self.undo_log.push_undo(label, self.apply_catalog_operation(operation))
+        self.update_undo_buttons()
+        self.info_label.setText(f"Redid {label}")
+
+    def update_undo_buttons(self):
+        undo_label, redo_label = self.undo_log.next_labels()
+        self.undo_button.setEnabled(undo_label is not None)
+        self.undo_button.setToolTip(f"Undo {undo_label} (Ctrl+Z)" if undo_label else "Nothing to undo")
+        self.redo_button.setEnabled(redo_label is not None)
+        self.redo_button.setToolTip(f"Redo {redo_label} (Ctrl+Y)" if redo_label else "Nothing to redo")
 
     ###########################################################################
     # ADD / EDIT / DELETE SHORTCUTS
@@ -757,80 +3621,353 @@ class Commander(QMainWindow):
         dialog = ShortcutDialog(self)  # no shortcut_data => new mode
         if dialog.exec_() == QDialog.Accepted:
             new_data = dialog.get_data()
-            self.shortcuts_data.append(new_data)
-            self.save_shortcuts()
-            # Re-filter or show all
-            current_filter = self.search_bar.text().strip()
-            if current_filter:
-                self.filter_table()
-            else:
-                pairs = [(s, i) for i, s in enumerate(self.shortcuts_data)]
-                self.populate_table(pairs)
+            self.add_shortcuts([new_data])
             self.info_label.setText(f"Added new shortcut: {new_data['name']}")
 
-            # Also update the sidebar (maybe new category was added)
-            self.update_category_sidebar()
-
     def on_edit_shortcut(self):
-        selected_items = self.table.selectedItems()
-        if not selected_items:
+        indices = self.selected_original_indices()
+        if len(indices) != 1:
             return
 
-        table_row = selected_items[0].row()
-        if table_row < 0 or table_row >= len(self.displayed_pairs):
-            return  # safety check
-
-        shortcut, original_index = self.displayed_pairs[table_row]
+        original_index = indices[0]
         original_data = self.shortcuts_data[original_index]
 
         dialog = ShortcutDialog(self, shortcut_data=original_data)
         if dialog.exec_() == QDialog.Accepted:
-            updated_data = dialog.get_data()
-            self.shortcuts_data[original_index] = updated_data
-            self.save_shortcuts()
-
-            # Re-filter or re-show all
-            current_filter = self.search_bar.text().strip()
-            if current_filter:
-                self.filter_table()
-            else:
-                pairs = [(s, i) for i, s in enumerate(self.shortcuts_data)]
-                self.populate_table(pairs)
-
-            # Also update sidebar if the category changed
-            self.update_category_sidebar()
+            # Keep fields the dialog doesn't know about (e.g. group)
+            updated_data = dict(original_data, **dialog.get_data())
+            self.replace_shortcuts({original_index: updated_data})
 
     def on_delete_shortcut(self):
-        selected_items = self.table.selectedItems()
-        if not selected_items:
+        indices = self.selected_original_indices()
+        if not indices:
             return
 
-        row = selected_items[0].row()
-        shortcut, original_index = self.displayed_pairs[row]
-        shortcut_name = shortcut.get("name", "")
+        if len(indices) == 1:
+            shortcut_name = self.shortcuts_data[indices[0]].get("name", "")
+            question = f"Are you sure you want to delete '{shortcut_name}'?"
+            done_text = f"Deleted shortcut: {shortcut_name}"
+        else:
+            question = f"Are you sure you want to delete {len(indices)} shortcuts?"
+            done_text = f"Deleted {len(indices)} shortcuts"
 
         reply = QMessageBox.question(
             self,
             "Confirm Delete",
-            f"Are you sure you want to delete '{shortcut_name}'?",
+            question,
             QMessageBox.Yes | QMessageBox.No,
             QMessageBox.No
         )
         if reply == QMessageBox.Yes:
-            self.shortcuts_data.pop(original_index)
+            self.delete_shortcuts(indices)
+            self.info_label.setText(done_text)
+
+    ###########################################################################
+    # BULK ACTIONS (selected rows)
+    ###########################################################################
+    def prompt_for_tags(self, title, count):
+        text, ok = QInputDialog.getText(
+            self,
+            title,
+            f"Tags for {count} shortcut(s) (comma-separated):",
+            QLineEdit.Normal
+        )
+        if not ok:
+            return []
+        return [tag.strip() for tag in text.split(",") if tag.strip()]
+
+    def on_bulk_set_category(self):
+        indices = self.selected_original_indices()
+        if not indices:
+            return
+
+        category, ok = QInputDialog.getText(
+            self,
+            "Set Category",
+            f"New category for {len(indices)} shortcut(s):",
+            QLineEdit.Normal,
+            self.catalog_index.display_name(self.selected_category) if self.selected_category else ""
+        )
+        if not ok:
+            return
+        category = category.strip()
+
+        self.replace_shortcuts({
+            i: dict(self.shortcuts_data[i], category=category)
+            for i in indices
+            if self.shortcuts_data[i].get("category", "") != category
+        }, undo_label="set category of")
+        self.info_label.setText(f"Moved {len(indices)} shortcut(s) to '{category or '(none)'}'")
+
+    def on_bulk_add_tags(self):
+        indices = self.selected_original_indices()
+        new_tags = self.prompt_for_tags("Add Tags", len(indices))
+        if not indices or not new_tags:
+            return
+
+        replacements = {}
+        for i in indices:
+            tags = self.shortcuts_data[i].get("tags", [])
+            missing = [tag for tag in new_tags if tag not in tags]
+            if missing:
+                replacements[i] = dict(self.shortcuts_data[i], tags=tags + missing)
+
+        self.replace_shortcuts(replacements, undo_label="add tags to")
+        self.info_label.setText(f"Added tags to {len(replacements)} shortcut(s)")
+
+    def on_bulk_remove_tags(self):
+        indices = self.selected_original_indices()
+        doomed_tags = {tag.lower() for tag in self.prompt_for_tags("Remove Tags", len(indices))}
+        if not indices or not doomed_tags:
+            return
+
+        replacements = {}
+        for i in indices:
+            tags = self.shortcuts_data[i].get("tags", [])
+            kept = [tag for tag in tags if tag.lower() not in doomed_tags]
+            if len(kept) != len(tags):
+                replacements[i] = dict(self.shortcuts_data[i], tags=kept)
+
+        self.replace_shortcuts(replacements, undo_label="remove tags from")
+        self.info_label.setText(f"Removed tags from {len(replacements)} shortcut(s)")
+
+    ###########################################################################
+    # FAN-OUT EXECUTION (one placeholder, many values)
+    ###########################################################################
+    def on_fan_out(self):
+        indices = self.selected_original_indices()
+        if len(indices) != 1:
+            self.info_label.setText("Select exactly one shortcut to fan out.")
+            return
+
+        shortcut = self.shortcuts_data[indices[0]]
+        placeholders = list(dict.fromkeys(
+            re.findall(r"{(.*?)}", shortcut.get("command", ""))
+            + re.findall(SCRIPT_PLACEHOLDER_RE, shortcut.get("script", ""))
+        ))
+        if not placeholders:
+            self.info_label.setText("This shortcut has no {placeholder} to fan out over.")
+            return
+
+        FanOutDialog(self, shortcut, placeholders).exec_()
+
+    def fan_out_commands(self, shortcut, placeholder, values):
+        """
+        Prompt once for every other placeholder, then build one full command
+        per value of the fanned-out placeholder.
+        Returns a list of (value, command, full_cmd), or None if cancelled.
+        """
+        command = shortcut.get("command", "").strip()
+        others = re.findall(r"{(.*?)}", command) + re.findall(SCRIPT_PLACEHOLDER_RE, shortcut.get("script", ""))
+        filled = {}
+        for ph in dict.fromkeys(others):
+            if ph == placeholder:
+                continue
+            val = self.prompt_for_variable(ph)
+            if not val:
+                self.info_label.setText("Command cancelled or no input provided.")
+                return None
+            command = command.replace(f"{{{ph}}}", val)
+            filled[ph] = val
+
+        commands = []
+        for value in values:
+            final_command = self.script_command(
+                shortcut,
+                dict(filled, **{placeholder: value}),
+                command.replace(f"{{{placeholder}}}", value)
+            )
+            if final_command is None:
+                return None
+            full_cmd = self.full_command(shortcut, final_command, keep_open=False)
+            if full_cmd is None:
+                return None
+            commands.append((value, final_command, full_cmd))
+        return commands
+
+    ###########################################################################
+    # SCHEDULED EXECUTION
+    ###########################################################################
+    def arm_schedule_timer(self):
+        """
+        Point the single schedule timer at the earliest due job (if any).
+        """
+        due = self.scheduler.next_due()
+        if due is None:
+            self.schedule_timer.stop()
+            return
+        delay_ms = int(max(0.0, due - time.time()) * 1000)
+        self.schedule_timer.start(min(delay_ms, SCHEDULE_MAX_SLEEP_MS))
+
+    def on_schedule_timer(self):
+        for job in self.scheduler.pop_due():
+            self.dispatch_scheduled_job(job)
+            self.settings_dirty = True
+        self.arm_schedule_timer()
+
+    def schedule_targets(self, job):
+        """
+        The shortcuts a job runs: one shortcut by name, or every member of a group.
+        """
+        target = job.get("target", "")
+        if job.get("target_type") == "group":
+            return [s for s in self.shortcuts_data if s.get("group", "") == target]
+        return [s for s in self.shortcuts_data if s.get("name", "") == target][:1]
+
+    def dispatch_scheduled_job(self, job):
+        job_id = job["id"]
+        shortcuts = self.schedule_targets(job)
+        if not shortcuts:
+            job["last_result"] = "target not found"
+            return
+
+        # Overlap policy: the previous run of this job is still going
+        if self.schedule_running.get(job_id):
+            overlap = job.get("overlap", "skip")
+            if overlap == "skip":
+                job["last_result"] = "skipped (previous run still active)"
+                return
+            if overlap == "queue":
+                self.schedule_deferred.add(job_id)  # at most one queued run
+                return
+
+        for shortcut in shortcuts:
+            self.schedule_running[job_id] = self.schedule_running.get(job_id, 0) + 1
+            self.start_scheduled_run(job, shortcut)
+
+    def start_scheduled_run(self, job, shortcut):
+        max_concurrency = self.settings_data.get("schedule_max_concurrency", DEFAULT_SCHEDULE_CONCURRENCY)
+        if self.schedule_active >= max_concurrency:
+            self.schedule_waiting.append((job, shortcut))
+            return
+
+        # Scheduled runs never prompt; placeholders come from the job's saved values
+        values = job.get("values", {})
+        command, missing = fill_placeholders(shortcut.get("command", "").strip(), values)
+        _, missing_in_script = fill_placeholders(shortcut.get("script", ""), values, SCRIPT_PLACEHOLDER_RE)
+        missing = list(dict.fromkeys(missing + missing_in_script))
+        if not missing:
+            command = self.script_command(shortcut, values, command)
+        task = self.capture_task(shortcut, command) if not missing and command is not None else None
+        if task is None:
+            job["last_result"] = f"needs input: {', '.join(missing)}" if missing else "invalid command"
+            self.on_scheduled_run_finished(job, shortcut, command, None, None)
+            return
+
+        self.schedule_active += 1
+        runner = CommandRunner(task, parent=self)
+        runner.finished.connect(
+            lambda result: self.on_scheduled_run_finished(job, shortcut, command, runner, result)
+        )
+        runner.start()
+
+    def on_scheduled_run_finished(self, job, shortcut, command, runner, result):
+        job_id = job["id"]
+        if runner is not None:
+            runner.deleteLater()
+            self.schedule_active -= 1
+            job["last_run"] = result.finished_at
+            job["last_result"] = f"exit code {result.exit_code}"
+            self.settings_dirty = True
+            self.record_captured_run(shortcut, command, result)
+
+            # A scheduled health check also warms the result cache
+            if shortcut.get("cache_output", False) and result.exit_code is not None:
+                self.result_cache.put(command, result, shortcut.get("cache_ttl", DEFAULT_CACHE_TTL))
+
+        self.schedule_running[job_id] -= 1
+        if not self.schedule_running[job_id]:
+            del self.schedule_running[job_id]
+            if job_id in self.schedule_deferred:
+                self.schedule_deferred.discard(job_id)
+                if job_id in self.scheduler.jobs:
+                    self.dispatch_scheduled_job(job)
+
+        self.drain_schedule_waiting()
+
+    def drain_schedule_waiting(self):
+        """
+        Hand free slots to waiting runs. A waiting run that can't start (e.g.
+        it needs input) finishes at once without taking its slot, so keep going
+        until the slots are full or nothing is waiting.
+        """
+        # A run that fails to start lands back here through
+        # on_scheduled_run_finished; the outer loop picks up where it left off
+        if self.schedule_draining:
+            return
+        self.schedule_draining = True
+        try:
+            max_concurrency = self.settings_data.get("schedule_max_concurrency", DEFAULT_SCHEDULE_CONCURRENCY)
+            while self.schedule_waiting and self.schedule_active < max_concurrency:
+                next_job, next_shortcut = self.schedule_waiting.popleft()
+                self.start_scheduled_run(next_job, next_shortcut)
+        finally:
+            self.schedule_draining = False
+
+    def on_manage_schedules(self):
+        dialog = ScheduleDialog(self)
+        dialog.exec_()
+        self.save_shortcuts()
+        self.arm_schedule_timer()
+
+    def on_show_history(self):
+        RunHistoryDialog(self, self.run_history.snapshot()).exec_()
+
+    def closeEvent(self, event):
+        # last_run / last_result and placeholder history aren't saved on every run, only on exit
+        if self.settings_dirty or self.dirty_uids:
             self.save_shortcuts()
+        self.shell_pool.close_all()
+        super().closeEvent(event)
 
-            current_filter = self.search_bar.text().strip()
-            if current_filter:
-                self.filter_table()
-            else:
-                pairs = [(s, i) for i, s in enumerate(self.shortcuts_data)]
-                self.populate_table(pairs)
+    ###########################################################################
+    # BULK IMPORT
+    ###########################################################################
+    def import_shortcuts(self, path):
+        """
+        Stream shortcuts from a JSON, JSON-lines or CSV file into the catalog.
+        Entries whose normalized name + command already exist are skipped.
+        Everything is committed with one save and one table/sidebar refresh.
+        Returns (added, duplicates, invalid) counts.
+        """
+        known_keys = {shortcut_key(s) for s in self.shortcuts_data}
+        new_shortcuts = []
+        duplicates = 0
+        invalid = 0
+
+        for raw in iter_import_records(path):
+            shortcut = coerce_import_record(raw)
+            if shortcut is None:
+                invalid += 1
+                continue
 
-            # Also refresh sidebar in case we removed the last item of a category
-            self.update_category_sidebar()
+            key = shortcut_key(shortcut)
+            if key in known_keys:
+                duplicates += 1
+                continue
+
+            known_keys.add(key)
+            new_shortcuts.append(shortcut)
+
+        self.add_shortcuts(new_shortcuts, undo_label="import")
+
+        return len(new_shortcuts), duplicates, invalid
+
+    def on_import_shortcuts(self):
+        file_filter = "Shortcut Files (*.json *.jsonl *.ndjson *.csv);;All Files (*)"
+        file_path, _ = QFileDialog.getOpenFileName(self, "Import Shortcuts", "", file_filter)
+        if not file_path:
+            return
+
+        try:
+            added, duplicates, invalid = self.import_shortcuts(file_path)
+        except (OSError, ValueError, csv.Error) as e:
+            QMessageBox.warning(self, "Import Failed", f"Could not import '{file_path}':\n{e}")
+            return
 
-            self.info_label.setText(f"Deleted shortcut: {shortcut_name}")
+        self.info_label.setText(
+            f"Imported {added} shortcut(s), skipped {duplicates} duplicate(s) and {invalid} invalid row(s)."
+        )
 ###############################################################################
 # Shortcut editing
 ###############################################################################
@@ -854,6 +3991,17 @@ class ShortcutDialog(QDialog):
         self.command_edit = QLineEdit()
         layout.addRow(QLabel("Command (use {placeholder} if needed):"), self.command_edit)
 
+        # Embedded script (multiline); the command above becomes its arguments
+        self.script_type_combo = QComboBox()
+        self.script_type_combo.addItems(list(SCRIPT_TYPES))
+        layout.addRow(QLabel("Script Type:"), self.script_type_combo)
+
+        self.script_edit = QTextEdit()
+        self.script_edit.setAcceptRichText(False)
+        self.script_edit.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        self.script_edit.setPlaceholderText("Optional script body, e.g. a multiline PowerShell script")
+        layout.addRow(QLabel("Script (use {name} placeholders):"), self.script_edit)
+
         # Description
         self.description_edit = QLineEdit()
         layout.addRow(QLabel("Description:"), self.description_edit)
@@ -864,12 +4012,29 @@ class ShortcutDialog(QDialog):
 
         # Category
         self.category_edit = QLineEdit()
-        layout.addRow(QLabel("Category:"), self.category_edit)
+        layout.addRow(QLabel("Category (use / for sub-categories):"), self.category_edit)
 
         # Requires Input? checkbox
         self.requires_input_checkbox = QCheckBox("Requires user input?")
         layout.addRow(QLabel("Input Needed:"), self.requires_input_checkbox)
 
+        # Cache output? (read-only diagnostics such as ipconfig / tasklist)
+        cache_layout = QHBoxLayout()
+        self.cache_output_checkbox = QCheckBox("Capture && cache output for")
+        self.cache_ttl_spin = QSpinBox()
+        self.cache_ttl_spin.setRange(1, 24 * 60 * 60)
+        self.cache_ttl_spin.setSuffix(" s")
+        self.cache_ttl_spin.setValue(DEFAULT_CACHE_TTL)
+        self.cache_ttl_spin.setEnabled(False)
+        self.cache_output_checkbox.toggled.connect(self.cache_ttl_spin.setEnabled)
+        cache_layout.addWidget(self.cache_output_checkbox)
+        cache_layout.addWidget(self.cache_ttl_spin)
+        layout.addRow(QLabel("Cache Result:"), cache_layout)
+
+        # Warm shell host? (skip interpreter startup for repeated scripts)
+        self.warm_host_checkbox = QCheckBox("Run in a pre-started shell (output is captured)")
+        layout.addRow(QLabel("Warm Shell:"), self.warm_host_checkbox)
+
         # Link script button if desired
         self.link_file_button = QPushButton("Link .exe, .bat, or .ps1")
         self.link_file_button.clicked.connect(self.on_link_file)
@@ -879,6 +4044,8 @@ class ShortcutDialog(QDialog):
         if self.edit_mode and shortcut_data is not None:
             self.name_edit.setText(shortcut_data.get("name", ""))
             self.command_edit.setText(shortcut_data.get("command", ""))
+            self.script_type_combo.setCurrentText(shortcut_data.get("script_type", "powershell"))
+            self.script_edit.setPlainText(shortcut_data.get("script", ""))
             self.description_edit.setText(shortcut_data.get("description", ""))
             tag_list = shortcut_data.get("tags", [])
             self.tags_edit.setText(", ".join(tag_list))
@@ -887,6 +4054,10 @@ class ShortcutDialog(QDialog):
             # Load the requires_input checkbox
             self.requires_input_checkbox.setChecked(shortcut_data.get("requires_input", False))
 
+            self.cache_output_checkbox.setChecked(shortcut_data.get("cache_output", False))
+            self.cache_ttl_spin.setValue(shortcut_data.get("cache_ttl", DEFAULT_CACHE_TTL))
+            self.warm_host_checkbox.setChecked(shortcut_data.get("warm_host", False))
+
         # OK / Cancel
         self.ok_button = QPushButton("OK")
         self.ok_button.clicked.connect(self.on_ok_clicked)
@@ -915,15 +4086,754 @@ class ShortcutDialog(QDialog):
         self.result_data = {
             "name": name,
             "command": command,
+            "script": self.script_edit.toPlainText().strip("\n"),
+            "script_type": self.script_type_combo.currentText(),
             "description": description,
             "tags": tags_list,
             "category": category,
-            "requires_input": requires_input
+            "requires_input": requires_input,
+            "cache_output": self.cache_output_checkbox.isChecked(),
+            "cache_ttl": self.cache_ttl_spin.value(),
+            "warm_host": self.warm_host_checkbox.isChecked()
+        }
+        self.accept()
+
+    def get_data(self):
+        return self.result_data
+
+###############################################################################
+# Captured command output
+###############################################################################
+
+class CommandOutputDialog(QDialog):
+    """
+    Non-modal window showing the captured output of a 'cache_output' or
+    'warm_host' shortcut, with a Refresh button that bypasses the cache.
+    """
+    def __init__(self, parent, name, command, on_refresh):
+        super().__init__(parent)
+        self.setWindowTitle(f"Output - {name}" if name else "Output")
+        self.resize(700, 450)
+
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        command_label = QLabel(command)
+        command_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        layout.addWidget(command_label)
+
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
+
+        self.output_edit = QTextEdit()
+        self.output_edit.setReadOnly(True)
+        self.output_edit.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        layout.addWidget(self.output_edit)
+
+        button_layout = QHBoxLayout()
+        self.refresh_button = QPushButton("Refresh")
+        self.refresh_button.clicked.connect(self.on_refresh_clicked)
+        self.on_refresh = on_refresh
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(self.close)
+        button_layout.addWidget(self.refresh_button)
+        button_layout.addWidget(close_button)
+        layout.addLayout(button_layout)
+
+    def on_refresh_clicked(self):
+        """
+        on_refresh returns False if no run started; set_result never comes
+        then, so the button is enabled again here.
+        """
+        self.refresh_button.setEnabled(False)
+        previous_status = self.status_label.text()
+        self.status_label.setText("Refreshing...")
+        if not self.on_refresh():
+            self.status_label.setText(f"{previous_status} | refresh could not start")
+            self.refresh_button.setEnabled(True)
+
+    def set_result(self, result, seconds_left):
+        finished = time.strftime("%H:%M:%S", time.localtime(result.finished_at))
+        status = f"Exit code {result.exit_code} | ran {result.duration:.2f}s | finished {finished}"
+        if seconds_left > 0:
+            status += f" | cached for {int(seconds_left)}s more"
+        self.status_label.setText(status)
+        self.output_edit.setPlainText(result.output)
+        self.refresh_button.setEnabled(True)
+###############################################################################
+# Schedules
+###############################################################################
+
+class ScheduleDialog(QDialog):
+    """
+    Lists scheduled jobs and lets the user add/remove them and set the
+    maximum number of scheduled runs that may execute at once.
+    """
+    def __init__(self, commander):
+        super().__init__(commander)
+        self.commander = commander
+        self.setWindowTitle("Schedules")
+        self.resize(800, 400)
+
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        self.table = QTableWidget()
+        self.table.setColumnCount(4)
+        self.table.setHorizontalHeaderLabels(["Target", "When", "Next Run", "Last Result"])
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.table)
+
+        concurrency_layout = QHBoxLayout()
+        concurrency_layout.addWidget(QLabel("Max concurrent scheduled runs:"))
+        self.concurrency_spin = QSpinBox()
+        self.concurrency_spin.setRange(1, 64)
+        self.concurrency_spin.setValue(
+            commander.settings_data.get("schedule_max_concurrency", DEFAULT_SCHEDULE_CONCURRENCY)
+        )
+        self.concurrency_spin.valueChanged.connect(self.on_concurrency_changed)
+        concurrency_layout.addWidget(self.concurrency_spin)
+        concurrency_layout.addStretch()
+        layout.addLayout(concurrency_layout)
+
+        button_layout = QHBoxLayout()
+        add_button = QPushButton("Add Schedule")
+        add_button.clicked.connect(self.on_add_schedule)
+        remove_button = QPushButton("Remove Selected")
+        remove_button.clicked.connect(self.on_remove_schedules)
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(self.accept)
+        button_layout.addWidget(add_button)
+        button_layout.addWidget(remove_button)
+        button_layout.addWidget(close_button)
+        layout.addLayout(button_layout)
+
+        self.refresh()
+
+    def refresh(self):
+        jobs = list(self.commander.scheduler.jobs.values())
+        self.job_ids = [job["id"] for job in jobs]
+        self.table.setRowCount(len(jobs))
+
+        for row, job in enumerate(jobs):
+            target = job.get("target", "")
+            if job.get("target_type") == "group":
+                target = f"Group: {target}"
+            due = self.commander.scheduler.next_due_for(job["id"])
+            next_run = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(due)) if due else "(disabled)"
+
+            self.table.setItem(row, 0, QTableWidgetItem(target))
+            self.table.setItem(row, 1, QTableWidgetItem(describe_schedule(job)))
+            self.table.setItem(row, 2, QTableWidgetItem(next_run))
+            self.table.setItem(row, 3, QTableWidgetItem(job.get("last_result", "")))
+
+        self.table.resizeColumnsToContents()
+
+    def on_concurrency_changed(self, value):
+        self.commander.settings_data["schedule_max_concurrency"] = value
+
+    def on_add_schedule(self):
+        dialog = ScheduleEditDialog(self, self.commander.shortcuts_data)
+        if dialog.exec_() == QDialog.Accepted:
+            self.commander.scheduler.add(dialog.get_data())
+            self.refresh()
+
+    def on_remove_schedules(self):
+        rows = {index.row() for index in self.table.selectionModel().selectedRows()}
+        for row in rows:
+            self.commander.scheduler.remove(self.job_ids[row])
+        self.refresh()
+
+
+class ScheduleEditDialog(QDialog):
+    def __init__(self, parent, shortcuts):
+        super().__init__(parent)
+        self.setWindowTitle("Add Schedule")
+        self.result_data = {}
+
+        self.shortcut_names = sorted({s.get("name", "") for s in shortcuts if s.get("name")})
+        self.group_names = sorted({s.get("group", "") for s in shortcuts if s.get("group")})
+
+        layout = QFormLayout()
+        self.setLayout(layout)
+
+        # What to run
+        self.target_type_combo = QComboBox()
+        self.target_type_combo.addItems(["Shortcut", "Group"])
+        self.target_type_combo.currentIndexChanged.connect(self.on_target_type_changed)
+        layout.addRow(QLabel("Run:"), self.target_type_combo)
+
+        self.target_combo = QComboBox()
+        self.target_combo.addItems(self.shortcut_names)
+        layout.addRow(QLabel("Target:"), self.target_combo)
+
+        # When to run it
+        self.kind_combo = QComboBox()
+        self.kind_combo.addItems(["Every N seconds", "Daily at time", "Once after delay"])
+        layout.addRow(QLabel("Schedule:"), self.kind_combo)
+
+        self.interval_spin = QSpinBox()
+        self.interval_spin.setRange(1, 7 * 24 * 60 * 60)
+        self.interval_spin.setValue(300)
+        self.interval_spin.setSuffix(" s")
+        layout.addRow(QLabel("Interval:"), self.interval_spin)
+
+        self.time_edit = QTimeEdit(QTime(9, 0))
+        self.time_edit.setDisplayFormat("HH:mm")
+        layout.addRow(QLabel("Time of day:"), self.time_edit)
+
+        self.delay_spin = QSpinBox()
+        self.delay_spin.setRange(0, 7 * 24 * 60 * 60)
+        self.delay_spin.setValue(60)
+        self.delay_spin.setSuffix(" s")
+        layout.addRow(QLabel("Delay:"), self.delay_spin)
+
+        # Policies
+        self.missed_combo = QComboBox()
+        self.missed_combo.addItems(["Run once when noticed", "Skip"])
+        layout.addRow(QLabel("Missed runs:"), self.missed_combo)
+
+        self.overlap_combo = QComboBox()
+        self.overlap_combo.addItems(["Skip if still running", "Queue one run", "Allow overlap"])
+        layout.addRow(QLabel("Overlap:"), self.overlap_combo)
+
+        # Scheduled runs can't prompt, so placeholder values are stored here
+        self.values_edit = QLineEdit()
+        self.values_edit.setPlaceholderText("host=example.com; port=443")
+        layout.addRow(QLabel("Placeholder values:"), self.values_edit)
+
+        self.ok_button = QPushButton("OK")
+        self.ok_button.clicked.connect(self.on_ok_clicked)
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.clicked.connect(self.reject)
+        layout.addRow(self.ok_button, self.cancel_button)
+
+    def on_target_type_changed(self, index):
+        self.target_combo.clear()
+        self.target_combo.addItems(self.group_names if index == 1 else self.shortcut_names)
+
+    def on_ok_clicked(self):
+        target = self.target_combo.currentText()
+        if not target:
+            QMessageBox.warning(self, "Add Schedule", "Pick a shortcut or group to run.")
+            return
+
+        values = {}
+        for pair in self.values_edit.text().split(";"):
+            key, sep, value = pair.partition("=")
+            if sep and key.strip():
+                values[key.strip()] = value.strip()
+
+        kind = SCHEDULE_KINDS[self.kind_combo.currentIndex()]
+        self.result_data = {
+            "target": target,
+            "target_type": "group" if self.target_type_combo.currentIndex() == 1 else "shortcut",
+            "kind": kind,
+            "missed": SCHEDULE_MISSED_POLICIES[self.missed_combo.currentIndex()],
+            "overlap": SCHEDULE_OVERLAP_POLICIES[self.overlap_combo.currentIndex()],
+            "values": values
         }
+        if kind == "interval":
+            self.result_data["interval"] = self.interval_spin.value()
+        elif kind == "daily":
+            self.result_data["time"] = self.time_edit.time().toString("HH:mm")
+        else:
+            self.result_data["delay"] = self.delay_spin.value()
         self.accept()
 
     def get_data(self):
         return self.result_data
+
+###############################################################################
+# Run history
+###############################################################################
+
+class NumericTableItem(QTableWidgetItem):
+    """
+    Table item that sorts by a number instead of its text. None sorts first.
+    """
+    def __init__(self, value, text=None):
+        if text is None:
+            text = "" if value is None else str(value)
+        super().__init__(text)
+        self.sort_value = float("-inf") if value is None else value
+
+    def __lt__(self, other):
+        if isinstance(other, NumericTableItem):
+            return self.sort_value < other.sort_value
+        return super().__lt__(other)
+
+
+class RunHistoryDialog(QDialog):
+    """
+    Sortable view of recorded runs, either one row per run or one row per
+    shortcut with aggregated cost, to spot expensive shortcuts.
+    """
+    def __init__(self, parent, records):
+        super().__init__(parent)
+        self.setWindowTitle("Run History")
+        self.resize(900, 500)
+        self.records = records
+
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        mode_layout = QHBoxLayout()
+        mode_layout.addWidget(QLabel("Show:"))
+        self.mode_combo = QComboBox()
+        self.mode_combo.addItems(["Every run", "Per shortcut"])
+        self.mode_combo.currentIndexChanged.connect(self.refresh)
+        mode_layout.addWidget(self.mode_combo)
+        mode_layout.addStretch()
+        mode_layout.addWidget(QLabel(f"{len(records)} run(s) recorded"))
+        layout.addLayout(mode_layout)
+
+        self.table = QTableWidget()
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        layout.addWidget(self.table)
+
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(self.accept)
+        layout.addWidget(close_button)
+
+        self.refresh()
+
+    @staticmethod
+    def mb(kb):
+        return None if kb is None else round(kb / 1024, 1)
+
+    @staticmethod
+    def seconds(value):
+        return None if value is None else round(value, 2)
+
+    def refresh(self):
+        self.table.setSortingEnabled(False)
+        self.table.clear()
+
+        if self.mode_combo.currentIndex() == 0:
+            headers = ["Shortcut", "Started", "Duration (s)", "Exit Code", "Peak RSS (MB)", "CPU (s)", "Command"]
+            rows = []
+            for r in self.records:
+                started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(r.started_at))
+                rows.append([
+                    QTableWidgetItem(r.name),
+                    NumericTableItem(r.started_at, started),
+                    NumericTableItem(self.seconds(r.wall_time)),
+                    NumericTableItem(r.exit_code),
+                    NumericTableItem(self.mb(r.peak_rss_kb)),
+                    NumericTableItem(self.seconds(r.cpu_time)),
+                    QTableWidgetItem(r.command),
+                ])
+        else:
+            headers = ["Shortcut", "Runs", "Avg Duration (s)", "Max Duration (s)",
+                       "Max Peak RSS (MB)", "Total CPU (s)", "Failures"]
+            stats = {}
+            for r in self.records:
+                s = stats.setdefault(r.name, {"runs": 0, "wall": 0.0, "max_wall": 0.0,
+                                              "rss": None, "cpu": None, "failures": 0})
+                s["runs"] += 1
+                s["wall"] += r.wall_time
+                s["max_wall"] = max(s["max_wall"], r.wall_time)
+                if r.peak_rss_kb is not None:
+                    s["rss"] = max(s["rss"] or 0, r.peak_rss_kb)
+                if r.cpu_time is not None:
+                    s["cpu"] = (s["cpu"] or 0.0) + r.cpu_time
+                if r.exit_code != 0:
+                    s["failures"] += 1
+
+            rows = [[
+                QTableWidgetItem(name),
+                NumericTableItem(s["runs"]),
+                NumericTableItem(self.seconds(s["wall"] / s["runs"])),
+                NumericTableItem(self.seconds(s["max_wall"])),
+                NumericTableItem(self.mb(s["rss"])),
+                NumericTableItem(self.seconds(s["cpu"])),
+                NumericTableItem(s["failures"]),
+            ] for name, s in stats.items()]
+
+        self.table.setColumnCount(len(headers))
+        self.table.setHorizontalHeaderLabels(headers)
+        self.table.setRowCount(len(rows))
+        for row_idx, items in enumerate(rows):
+            for col, item in enumerate(items):
+                self.table.setItem(row_idx, col, item)
+
+        self.table.resizeColumnsToContents()
+        self.table.setSortingEnabled(True)
+        self.table.sortItems(2, Qt.DescendingOrder)  # most expensive first
+
+###############################################################################
+# Fan-out
+###############################################################################
+
+class FanOutDialog(QDialog):
+    """
+    Runs one placeholder shortcut once per value (pasted or loaded from a file)
+    on a bounded worker pool and shows a per-value summary table.
+    """
+    def __init__(self, commander, shortcut, placeholders):
+        super().__init__(commander)
+        self.commander = commander
+        self.shortcut = shortcut
+        self.runner = None
+        self.commands = []
+        self.value_rows = {}
+        self.results = {}
+        self.started = time.monotonic()
+
+        self.setWindowTitle(f"Fan Out - {shortcut.get('name', '')}")
+        self.resize(850, 600)
+
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        form = QFormLayout()
+        form.addRow(QLabel("Command:"), QLabel(shortcut.get("command", "")))
+
+        self.placeholder_combo = QComboBox()
+        self.placeholder_combo.addItems(placeholders)
+        form.addRow(QLabel("Fan out over:"), self.placeholder_combo)
+
+        values_layout = QVBoxLayout()
+        self.values_edit = QTextEdit()
+        self.values_edit.setAcceptRichText(False)
+        self.values_edit.setPlaceholderText("One value per line (lines starting with # are ignored)")
+        load_button = QPushButton("Load from File...")
+        load_button.clicked.connect(self.on_load_values)
+        values_layout.addWidget(self.values_edit)
+        values_layout.addWidget(load_button)
+        form.addRow(QLabel("Values:"), values_layout)
+
+        self.concurrency_spin = QSpinBox()
+        self.concurrency_spin.setRange(1, 64)
+        self.concurrency_spin.setValue(8)
+        form.addRow(QLabel("Run at once:"), self.concurrency_spin)
+        layout.addLayout(form)
+
+        button_layout = QHBoxLayout()
+        self.run_button = QPushButton("Run All")
+        self.run_button.clicked.connect(self.on_run)
+        self.stop_button = QPushButton("Stop")
+        self.stop_button.setEnabled(False)
+        self.stop_button.clicked.connect(self.on_stop)
+        button_layout.addWidget(self.run_button)
+        button_layout.addWidget(self.stop_button)
+        layout.addLayout(button_layout)
+
+        self.summary_label = QLabel("")
+        layout.addWidget(self.summary_label)
+
+        self.table = QTableWidget()
+        self.table.setColumnCount(4)
+        self.table.setHorizontalHeaderLabels(["Value", "Status", "Exit Code", "Duration (s)"])
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.setSelectionMode(QTableWidget.SingleSelection)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.itemSelectionChanged.connect(self.on_result_selected)
+        layout.addWidget(self.table)
+
+        self.output_edit = QTextEdit()
+        self.output_edit.setReadOnly(True)
+        self.output_edit.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        layout.addWidget(self.output_edit)
+
+    def on_load_values(self):
+        file_path, _ = QFileDialog.getOpenFileName(self, "Load Values", "", "Text Files (*.txt *.csv);;All Files (*)")
+        if not file_path:
+            return
+        try:
+            with open(file_path, "r", encoding="utf-8-sig") as f:
+                self.values_edit.setPlainText(f.read())
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Load Values", f"Could not read '{file_path}':\n{e}")
+
+    def values(self):
+        lines = (line.strip() for line in self.values_edit.toPlainText().splitlines())
+        # Keep order, drop blanks, comments and duplicates
+        return list(dict.fromkeys(line for line in lines if line and not line.startswith("#")))
+
+    def on_run(self):
+        values = self.values()
+        if not values:
+            self.summary_label.setText("Enter at least one value.")
+            return
+
+        commands = self.commander.fan_out_commands(
+            self.shortcut, self.placeholder_combo.currentText(), values
+        )
+        if not commands:
+            return
+
+        self.commands = commands
+        self.value_rows = {value: index for index, (value, _, _) in enumerate(commands)}
+        self.results = {}
+        self.started = time.monotonic()
+
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(commands))
+        for row, (value, _, _) in enumerate(commands):
+            self.table.setItem(row, 0, QTableWidgetItem(value))
+            self.table.setItem(row, 1, QTableWidgetItem("Running..."))
+            self.table.setItem(row, 2, NumericTableItem(None))
+            self.table.setItem(row, 3, NumericTableItem(None))
+        self.table.resizeColumnsToContents()
+
+        self.runner = FanOutRunner([full_cmd for _, _, full_cmd in commands], self.concurrency_spin.value())
+        self.runner.result_ready.connect(self.on_result_ready)
+        self.run_button.setEnabled(False)
+        self.stop_button.setEnabled(True)
+        self.update_summary()
+        self.runner.start()
+
+    def on_stop(self):
+        if self.runner is not None:
+            self.runner.stop()
+        self.stop_button.setEnabled(False)
+
+    def on_result_ready(self, index, result):
+        _, command, _ = self.commands[index]
+        self.results[index] = result
+        self.commander.record_captured_run(self.shortcut, command, result)
+
+        # Sorting stays off until every result is in, so row == index
+        row = index
+        self.table.setItem(row, 1, QTableWidgetItem("OK" if result.exit_code == 0 else "Failed"))
+        self.table.setItem(row, 2, NumericTableItem(result.exit_code))
+        self.table.setItem(row, 3, NumericTableItem(round(result.duration, 2)))
+
+        if len(self.results) == len(self.commands):
+            self.run_button.setEnabled(True)
+            self.stop_button.setEnabled(False)
+            self.table.setSortingEnabled(True)
+        self.update_summary()
+
+    def update_summary(self):
+        ok = sum(1 for r in self.results.values() if r.exit_code == 0)
+        failed = len(self.results) - ok
+        pending = len(self.commands) - len(self.results)
+        elapsed = time.monotonic() - self.started
+        self.summary_label.setText(
+            f"{ok} succeeded, {failed} failed, {pending} pending | {elapsed:.1f}s elapsed"
+        )
+
+    def on_result_selected(self):
+        rows = self.table.selectionModel().selectedRows()
+        if not rows:
+            return
+        index = self.value_rows[self.table.item(rows[0].row(), 0).text()]
+        _, command, _ = self.commands[index]
+        result = self.results.get(index)
+        self.output_edit.setPlainText(f"> {command}\n\n" + (result.output if result else "(still running)"))
+
+    def reject(self):
+        # Closing the window stops anything that hasn't started yet
+        self.on_stop()
+        super().reject()
+
+###############################################################################
+# Command palette
+###############################################################################
+
+class CommandPaletteDialog(QDialog):
+    """
+    Ctrl+P / Ctrl+K: type any word of a shortcut's name, pick a match with
+    the arrow keys and press Enter twice (Execute, then Confirm) to run it.
+    Placeholders are asked for in the same box, completing from values
+    used before.
+    """
+    def __init__(self, commander):
+        super().__init__(commander)
+        self.commander = commander
+        self.stage = "name"        # "name" -> "value" (per placeholder) -> "confirm"
+        self.shortcut = None
+        self.placeholders = []     # placeholder names still to fill in
+        self.values = {}
+        self.matches = []          # shortcuts (name stage) or values (value stage) in the list
+
+        self.setWindowTitle("Run Shortcut")
+        self.resize(560, 380)
+
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        self.prompt_label = QLabel("Shortcut:")
+        layout.addWidget(self.prompt_label)
+
+        self.input_edit = QLineEdit()
+        self.input_edit.setPlaceholderText("Type part of a shortcut name...")
+        self.input_edit.textChanged.connect(self.on_text_changed)
+        layout.addWidget(self.input_edit)
+
+        self.matches_list = QListWidget()
+        self.matches_list.setFocusPolicy(Qt.NoFocus)  # typing always goes to the input box
+        self.matches_list.itemDoubleClicked.connect(lambda item: self.on_enter())
+        layout.addWidget(self.matches_list)
+
+        self.hint_label = QLabel("")
+        layout.addWidget(self.hint_label)
+
+        self.show_matches()
+
+    def keyPressEvent(self, event):
+        key = event.key()
+        if key in (Qt.Key_Up, Qt.Key_Down):
+            self.move_selection(-1 if key == Qt.Key_Up else 1)
+        elif key in (Qt.Key_Return, Qt.Key_Enter):
+            self.on_enter()
+        else:
+            super().keyPressEvent(event)  # Esc closes the palette
+
+    def move_selection(self, step):
+        count = self.matches_list.count()
+        if count:
+            row = self.matches_list.currentRow()
+            row = 0 if row < 0 and step > 0 else max(0, min(count - 1, row + step))
+            self.matches_list.setCurrentRow(row)
+
+    def on_text_changed(self, text):
+        if self.stage == "confirm":
+            # Typing again instead of confirming starts a new search
+            self.stage = "name"
+            self.shortcut = None
+            self.values = {}
+            self.prompt_label.setText("Shortcut:")
+            self.input_edit.setPlaceholderText("Type part of a shortcut name...")
+        self.show_matches()
+
+    def show_matches(self):
+        text = self.input_edit.text()
+        self.matches_list.clear()
+
+        if self.stage == "name":
+            self.matches = self.commander.palette_matches(text)
+            for shortcut in self.matches:
+                self.matches_list.addItem(f"{shortcut.get('name', '')}  -  {shortcut.get('command', '')}")
+            if self.matches:
+                self.matches_list.setCurrentRow(0)
+            self.set_hint("Up/Down to choose, Enter to execute, Esc to close")
+        else:
+            # Most recent values for this placeholder that start with what's typed
+            prefix = text.strip().lower()
+            self.matches = [
+                value for value in self.commander.placeholder_history(self.placeholders[0])
+                if value.lower().startswith(prefix)
+            ][:PALETTE_MAX_RESULTS]
+            self.matches_list.addItems(self.matches)
+            self.set_hint("Enter to use the typed value, or Up/Down to pick a previous one")
+
+    def set_hint(self, text, confirm=False):
+        self.hint_label.setText(text)
+        self.hint_label.setStyleSheet("color: green; font-weight: bold;" if confirm else "")
+
+    def on_enter(self):
+        row = self.matches_list.currentRow()
+
+        if self.stage == "name":
+            if row < 0:
+                return
+            self.shortcut = self.matches[row]
+            self.placeholders = shortcut_placeholders(self.shortcut)
+            self.next_step()
+        elif self.stage == "value":
+            value = self.matches[row] if row >= 0 else self.input_edit.text().strip()
+            if not value:
+                return
+            self.values[self.placeholders.pop(0)] = value
+            self.next_step()
+        else:
+            self.accept()
+            self.commander.run_shortcut(self.shortcut, self.values)
+
+    def next_step(self):
+        """
+        Ask for the next placeholder, or wait for the confirming Enter.
+        """
+        self.input_edit.blockSignals(True)
+        self.input_edit.clear()
+        self.input_edit.blockSignals(False)
+
+        if self.placeholders:
+            self.stage = "value"
+            self.prompt_label.setText(f"{self.shortcut.get('name', '')} - enter {self.placeholders[0]}:")
+            self.input_edit.setPlaceholderText(self.placeholders[0])
+            self.show_matches()
+            return
+
+        self.stage = "confirm"
+        command, _ = fill_placeholders(self.shortcut.get("command", ""), self.values)
+        self.prompt_label.setText(f"{self.shortcut.get('name', '')}: {command}")
+        self.input_edit.setPlaceholderText("")
+        self.matches_list.clear()
+        self.matches = []
+        self.set_hint("Press Enter again to confirm", confirm=True)
+
+###############################################################################
+# Shared catalog conflicts
+###############################################################################
+
+class CatalogConflictDialog(QDialog):
+    """
+    Lists shortcuts that were changed both here and by another Commander
+    sharing shortcuts.json since this one last saved, and lets the user keep
+    either side of each.
+    """
+    def __init__(self, commander, conflicts):
+        super().__init__(commander)
+        self.setWindowTitle("Conflicting Changes")
+        self.resize(800, 350)
+        self.uids = list(conflicts)
+
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+        layout.addWidget(QLabel(
+            "These shortcuts were also changed by another Commander using the same file.\n"
+            "Choose which version to keep."
+        ))
+
+        self.table = QTableWidget(len(self.uids), 4)
+        self.table.setHorizontalHeaderLabels(["Shortcut", "Here", "Other Commander", "Keep"])
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.choice_combos = []
+        for row, uid in enumerate(self.uids):
+            mine, theirs = conflicts[uid]
+            name = (mine or theirs).get("name", "")
+            self.table.setItem(row, 0, QTableWidgetItem(name))
+            self.table.setItem(row, 1, QTableWidgetItem(self.describe(mine)))
+            self.table.setItem(row, 2, QTableWidgetItem(self.describe(theirs)))
+
+            combo = QComboBox()
+            combo.addItems(["Mine", "Theirs"])
+            self.table.setCellWidget(row, 3, combo)
+            self.choice_combos.append(combo)
+        self.table.resizeColumnsToContents()
+        layout.addWidget(self.table)
+
+        button_layout = QHBoxLayout()
+        ok_button = QPushButton("Apply")
+        ok_button.clicked.connect(self.accept)
+        later_button = QPushButton("Decide Later")
+        later_button.clicked.connect(self.reject)
+        button_layout.addWidget(ok_button)
+        button_layout.addWidget(later_button)
+        layout.addLayout(button_layout)
+
+    @staticmethod
+    def describe(shortcut):
+        if shortcut is None:
+            return "(deleted)"
+        return shortcut.get("command", "") or f"[{shortcut.get('script_type', 'powershell')} script]"
+
+    def get_choices(self):
+        """
+        uid -> "mine" or "theirs".
+        """
+        return {
+            uid: "mine" if combo.currentIndex() == 0 else "theirs"
+            for uid, combo in zip(self.uids, self.choice_combos)
+        }
+
 def main():
     """
     Main entry point. Attempt to re-run as admin if not already.
@@ -935,47 +4845,19 @@ def main():
         # So this current (non-admin) process should exit.
         sys.exit(0)
 
+    # --catalog lets several Commanders (or users) share one shortcuts.json;
+    # everything else is left for Qt
+    parser = argparse.ArgumentParser(description="Commander")
+    parser.add_argument("--catalog", help="path of the shortcuts.json to use")
+    args, qt_args = parser.parse_known_args()
+
     # Otherwise, continue as is (already admin or failed to elevate).
-    app = QApplication(sys.argv)
+    app = QApplication(sys.argv[:1] + qt_args)
 
     # Use a more modern built-in style
     app.setStyle(QStyleFactory.create("Fusion"))
 
-    # A basic Fusion stylesheet
-    app.setStyleSheet("""
-        QMainWindow {
-            background-color: #f0f0f0;
-        }
-        QLabel {
-            font-size: 14px;
-        }
-        QLineEdit {
-            font-size: 14px;
-            padding: 4px;
-        }
-        QTableWidget {
-            background-color: #ffffff;
-            gridline-color: #cccccc;
-            font-size: 14px;
-        }
-        QTableWidget::item:selected {
-            background-color: #0078d7;
-            color: #ffffff;
-        }
-        QPushButton {
-            font-size: 14px;
-            padding: 6px 12px;
-        }
-        QToolTip {
-            background-color: #222222;
-            color: #ffffff;
-            border: 1px solid #aaaaaa;
-            padding: 5px;
-            font-size: 12px;
-        }
-    """)
-
-    window = Commander()
+    window = Commander(json_path=os.path.abspath(args.catalog)) if args.catalog else Commander()
     window.show()
     sys.exit(app.exec_())
 
@@ -0,0 +1,33 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import INDEX_BATCH_MIN, CatalogIndex
+
+
+def shortcut(i):
+    return {"name": f"tool {i % 37} run {i}", "category": f"C{i % 11}/S{i % 5}", "tags": [f"t{i % 3}"], "group": "g"}
+
+
+def assert_same_index(index, shortcuts):
+    expected = CatalogIndex(shortcuts)
+    assert index.name_keys == expected.name_keys
+    assert index.category_keys == expected.category_keys
+    assert index.by_category == expected.by_category
+    assert index.by_tag == expected.by_tag
+    assert index.by_group == expected.by_group
+
+
+def test_batch_add_and_remove_match_rebuild():
+    base = [shortcut(i) for i in range(100)]
+    for size in (3, INDEX_BATCH_MIN + 50):
+        batch = [(100 + i, shortcut(1000 + i)) for i in range(size)]
+        batch[-1] = (batch[-1][0], dict(batch[-1][1], category="Brand/New"))
+
+        index = CatalogIndex(base)
+        index.add_many(batch)
+        assert_same_index(index, base + [s for _, s in batch])
+
+        index.remove_many(batch)
+        assert_same_index(index, base)
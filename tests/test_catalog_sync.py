@@ -0,0 +1,88 @@
+import json
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+pytest.importorskip("PyQt5")
+from PyQt5.QtWidgets import QApplication
+
+import main
+from main import read_catalog_file
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def commander(app, tmp_path):
+    window = main.Commander(json_path=str(tmp_path / "shortcuts.json"))
+    window.show()
+    deadline = time.monotonic() + 30
+    while (window.startup_pending or window.table_fill_timer.isActive()) and time.monotonic() < deadline:
+        app.processEvents()
+    yield window
+    window.close()
+
+
+def write_raw(path, text):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def disk_records(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["shortcuts"]
+
+
+def test_read_catalog_file_rejects_non_catalogs(tmp_path):
+    path = str(tmp_path / "shortcuts.json")
+    assert read_catalog_file(path) is None
+    for text in ['{"shortcuts": [{"na', "[]", "{}", '{"shortcuts": {}}', ""]:
+        write_raw(path, text)
+        assert read_catalog_file(path) is None, text
+    write_raw(path, '{"shortcuts": []}')
+    assert read_catalog_file(path) == {"shortcuts": []}
+
+
+def test_sync_ignores_truncated_file(commander):
+    count = len(commander.shortcuts_data)
+    assert count > 0
+    write_raw(commander.json_path, '{"shortcuts": [{"name": "Pi')
+
+    commander.on_sync_timer()
+    QApplication.processEvents()
+
+    assert len(commander.shortcuts_data) == count
+    assert commander.table.rowCount() == count
+
+
+def test_save_over_corrupt_file_writes_local_records(commander):
+    count = len(commander.shortcuts_data)
+    write_raw(commander.json_path, "not json")
+
+    commander.add_shortcuts([{"name": "After corruption", "command": "echo ok"}])
+    QApplication.processEvents()
+
+    assert len(commander.shortcuts_data) == count + 1
+    assert [s["uid"] for s in disk_records(commander.json_path)] == [s["uid"] for s in commander.shortcuts_data]
+
+
+def test_save_waits_while_disk_uids_are_not_unique(commander):
+    count = len(commander.shortcuts_data)
+    legacy = json.dumps({"shortcuts": [{"name": "a", "command": "echo a"}, {"name": "b", "command": "echo b"}]})
+    write_raw(commander.json_path, legacy)
+
+    commander.add_shortcuts([{"name": "Pending", "command": "echo pending"}])
+    QApplication.processEvents()
+
+    with open(commander.json_path, "r", encoding="utf-8") as f:
+        assert f.read() == legacy
+    assert commander.dirty_uids
+    assert len(commander.shortcuts_data) == count + 1
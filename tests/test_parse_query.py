@@ -0,0 +1,27 @@
+import itertools
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import parse_query
+
+
+OPERATOR_TOKENS = ["NOT", "AND", "OR", "(", ")", "-(", "x", "tag:a"]
+
+
+def test_operator_only_queries_never_raise():
+    for length in range(1, 5):
+        for combo in itertools.product(OPERATOR_TOKENS, repeat=length):
+            parse_query(" ".join(combo))
+
+
+def test_not_and_reads_as_not():
+    assert parse_query("NOT AND x") == ("not", ("text", "x"))
+    assert parse_query("( NOT AND )") is None
+    assert parse_query("AND OR NOT") is None
+
+
+def test_regular_queries():
+    assert parse_query("tag:a OR tag:b") == ("or", [("field", "tag", "a"), ("field", "tag", "b")])
+    assert parse_query("ping -tag:windows") == ("and", [("text", "ping"), ("not", ("field", "tag", "windows"))])
@@ -0,0 +1,41 @@
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import script_argv, script_template
+
+
+def run_template(tmp_path, body, script_type, values, args):
+    path = tmp_path / f"script.{script_type}"
+    path.write_text(script_template(body, script_type, list(values)), encoding="utf-8")
+    argv = script_argv(script_type, str(path), list(values.values()) + args, keep_open=False)
+    if script_type == "python":
+        argv[0] = sys.executable
+    return path.read_text(encoding="utf-8"), subprocess.run(argv, capture_output=True, text=True).stdout
+
+
+@pytest.mark.skipif(shutil.which("bash") is None, reason="needs bash")
+def test_bash_placeholders_come_from_arguments(tmp_path):
+    body = '#!/bin/bash\necho "host={host}"\necho "args: $*"'
+    cached, output = run_template(tmp_path, body, "bash", {"host": "secret-host"}, ["a", "b c"])
+    assert "secret-host" not in cached
+    assert cached.startswith("#!/bin/bash\n")
+    assert output == "host=secret-host\nargs: a b c\n"
+
+
+def test_python_placeholders_come_from_arguments(tmp_path):
+    body = "import sys\nprint('{host}', '{0}', sys.argv[1:])"
+    cached, output = run_template(tmp_path, body, "python", {"host": "secret-host"}, ["a"])
+    assert "secret-host" not in cached
+    assert output == "secret-host {0} ['a']\n"
+
+
+def test_same_file_for_every_value():
+    body = 'echo "{host}"'
+    assert script_template(body, "batch", ["host"]) == '@set "COMMANDER_host=%~1"\n@shift\necho "%COMMANDER_host%"'
+    assert script_template(body, "powershell", []) == body
@@ -0,0 +1,65 @@
+import os
+import shutil
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from main import ShellHost, ShellHostPool
+
+pytestmark = pytest.mark.skipif(
+    sys.platform == "win32" or shutil.which("bash") is None, reason="needs a bash host"
+)
+
+
+@pytest.fixture
+def host():
+    host = ShellHost("bash")
+    yield host
+    host.close()
+
+
+def test_output_is_framed_by_the_sentinel(host):
+    result = host.run("echo one; printf 'no newline'")
+    assert result.output == "one\nno newline"
+    assert result.exit_code == 0
+
+    # The next command's output doesn't pick up anything from the last one
+    result = host.run("echo \"it's\" 'quoted'; echo two >&2")
+    assert result.output == "it's quoted\ntwo\n"
+
+
+def test_exit_codes(host):
+    assert host.run("false").exit_code == 1
+    assert host.run("exit 3").exit_code == 3
+    assert host.run("cd /; x=1").exit_code == 0
+    # Each command runs in a subshell, so exit, cd and variables don't leak
+    assert host.run("pwd; echo \"[$x]\"").output == f"{host.cwd}\n[]\n"
+    assert host.alive()
+
+
+def test_hung_command_kills_host_and_pool_replaces_it():
+    pool = ShellHostPool(size=1)
+    try:
+        result = pool.run("bash", "sleep 30", timeout=0.5)
+        assert result.exit_code is None
+        assert "[Killed after 0.5 seconds]" in result.output
+
+        result = pool.run("bash", "echo back")
+        assert (result.output, result.exit_code) == ("back\n", 0)
+    finally:
+        pool.close_all()
+
+
+def test_commands_run_under_limits(host, monkeypatch):
+    monkeypatch.setattr(main, "SHELL_HOST_MAX_MEMORY", 256 * 1024 * 1024)
+    result = host.run(f"'{sys.executable}' -c 'bytearray(512 * 1024 * 1024)'")
+    assert result.exit_code != 0
+    assert "MemoryError" in result.output
+
+    monkeypatch.setattr(main, "SHELL_HOST_MAX_CPU_SECONDS", 1)
+    result = host.run(f"'{sys.executable}' -c 'while True: pass'", timeout=20)
+    assert result.exit_code == 128 + 24  # SIGXCPU
+    assert host.run("echo alive").output == "alive\n"